@@ -0,0 +1,36 @@
+import argparse
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='run conversion benchmarks')
+    parser.add_argument('--suite', type=str, default='all', choices=[
+        'all', 'corner_dedup', 'pipeline', 'storage', 'import_time', 'edge_sampling', 'face_edge_adj'])
+    parser.add_argument('--output', type=str, default=None, help='json file path for pipeline results')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pkl', type=str, nargs='*', default=None, help='converted pkl files for the storage suite')
+    args = parser.parse_args()
+
+    # 各测试只在运行时导入，避免storage等不依赖OCC的测试也加载OCC
+    if args.suite in ['all', 'import_time']:
+        from muv_convert.Benchmark.import_time import benchmark as benchmark_import_time
+        benchmark_import_time(args.repeat)
+
+    if args.suite in ['all', 'corner_dedup']:
+        from muv_convert.Benchmark.corner_dedup import benchmark as benchmark_corner_dedup
+        benchmark_corner_dedup()
+
+    if args.suite in ['all', 'face_edge_adj']:
+        from muv_convert.Benchmark.face_edge_adj import benchmark as benchmark_face_edge_adj
+        benchmark_face_edge_adj(args.repeat)
+
+    if args.suite in ['all', 'edge_sampling']:
+        from muv_convert.Benchmark.edge_sampling import benchmark as benchmark_edge_sampling
+        benchmark_edge_sampling(repeat_num=args.repeat)
+
+    if args.suite in ['all', 'pipeline']:
+        from muv_convert.Benchmark.pipeline import benchmark as benchmark_pipeline
+        benchmark_pipeline(args.output, args.repeat)
+
+    if args.suite in ['all', 'storage']:
+        from muv_convert.Benchmark.storage import benchmark as benchmark_storage
+        benchmark_storage(args.pkl, args.repeat)
@@ -0,0 +1,44 @@
+import argparse
+
+from muv_convert.Module.muv_convertor import MUVConvertor
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='convert all step files in a folder to pkl files')
+    parser.add_argument('step_root_folder_path', type=str)
+    parser.add_argument('save_pkl_root_folder_path', type=str)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--overwrite', action='store_true')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds per file')
+    parser.add_argument('--memory_limit_mb', type=int, default=None, help='virtual memory limit per file')
+    parser.add_argument('--manifest', type=str, default=None, help='jsonl manifest file path')
+    parser.add_argument('--max_face_num', type=int, default=None, help='skip solids with more faces')
+    parser.add_argument('--max_edge_num', type=int, default=None, help='skip solids with more edges')
+    parser.add_argument('--instrument', action='store_true', help='record per-stage timings for each file')
+    parser.add_argument('--normalize', action='store_true', help='save bboxes and normalized local coordinates')
+    parser.add_argument('--compact', action='store_true', help='save the compact typed schema')
+    parser.add_argument('--coord_dtype', type=str, default='float32', choices=['float32', 'float16', 'uint16'],
+                        help='coordinate dtype of the compact schema')
+    parser.add_argument('--storage', type=str, default='pkl', choices=['pkl', 'npz', 'zstd'],
+                        help='storage backend of the converted files')
+    parser.add_argument('--incremental', action='store_true', help='only convert new or changed step files')
+    args = parser.parse_args()
+
+    muv_convertor = MUVConvertor(
+        max_face_num=args.max_face_num,
+        max_edge_num=args.max_edge_num,
+        instrument=args.instrument,
+        compact=args.compact,
+        coord_dtype=args.coord_dtype,
+        storage_backend=args.storage,
+        normalize=args.normalize,
+    )
+    muv_convertor.convertDataset(
+        args.step_root_folder_path,
+        args.save_pkl_root_folder_path,
+        args.workers,
+        args.overwrite,
+        args.timeout,
+        None if args.memory_limit_mb is None else args.memory_limit_mb * 1024 * 1024,
+        args.manifest,
+        args.incremental,
+    )
@@ -0,0 +1,38 @@
+import argparse
+
+from muv_convert.Module.igs_convertor import IGSConvertor
+from muv_convert.Module.muv_convertor import MUVConvertor
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='convert all igs files in a folder to step or pkl files')
+    parser.add_argument('igs_root_folder_path', type=str)
+    parser.add_argument('save_root_folder_path', type=str)
+    parser.add_argument('--to', type=str, default='step', choices=['step', 'pkl'])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--overwrite', action='store_true')
+    parser.add_argument('--timeout', type=float, default=None, help='seconds per file')
+    parser.add_argument('--manifest', type=str, default=None, help='jsonl manifest file path')
+    args = parser.parse_args()
+
+    if args.to == 'step':
+        igs_convertor = IGSConvertor()
+        igs_convertor.convertIGSFolder(
+            args.igs_root_folder_path,
+            args.save_root_folder_path,
+            args.workers,
+            args.overwrite,
+            args.timeout,
+            args.manifest,
+        )
+    else:
+        # 直接采样为pkl，跳过中间STEP文件
+        muv_convertor = MUVConvertor()
+        muv_convertor.convertDataset(
+            args.igs_root_folder_path,
+            args.save_root_folder_path,
+            args.workers,
+            args.overwrite,
+            args.timeout,
+            manifest_file_path=args.manifest,
+            ext_list=['.igs', '.iges'],
+        )
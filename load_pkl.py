@@ -1,10 +1,10 @@
-import pickle
 import numpy as np
 
+from muv_convert.Method.pkl import load_pkl_file
+
 pkl_file_path = "/Users/chli/chLi/Dataset/ABC/pkl/00000050_80d90bfdd2e74e709956122a_step_000.pkl"
 
-with open(pkl_file_path, "rb") as f:
-    shape_data_list = pickle.load(f)
+shape_data_list = load_pkl_file(pkl_file_path)
 
 for shape_data in shape_data_list:
     data_type = shape_data['type']
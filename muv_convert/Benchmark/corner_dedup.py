@@ -0,0 +1,74 @@
+import numpy as np
+from time import time
+
+from muv_convert.Method.convert_utils import merge_corners
+
+
+def merge_corners_loop(edge_corner_pnts, decimals: int = 4):
+    """
+    parse_shape中原有的逐顶点去重实现，仅用于对比
+    """
+    corner_pnts = np.round(edge_corner_pnts, decimals)
+    corner_unique = []
+    for corner_pnt in corner_pnts.reshape(-1, 3):
+        if len(corner_unique) == 0:
+            corner_unique = corner_pnt.reshape(1, 3)
+        else:
+            exists = np.any(np.all(corner_unique == corner_pnt, axis=1))
+            if not exists:
+                corner_unique = np.concatenate([corner_unique, corner_pnt.reshape(1, 3)], 0)
+    corner_unique = np.asarray(corner_unique) if len(corner_unique) > 0 else np.array([]).reshape(0, 3)
+
+    edgeCorner_IncM = []
+    if corner_unique.size > 0 and corner_pnts.size > 0:
+        for edge_corner in corner_pnts:
+            start_corner_idx = np.where((corner_unique == edge_corner[0]).all(axis=1))[0].item()
+            end_corner_idx = np.where((corner_unique == edge_corner[1]).all(axis=1))[0].item()
+            edgeCorner_IncM.append([start_corner_idx, end_corner_idx])
+    edgeCorner_IncM = np.array(edgeCorner_IncM) if len(edgeCorner_IncM) > 0 else np.array([]).reshape(0, 2)
+    return corner_unique, edgeCorner_IncM
+
+
+def create_edge_corner_pnts(edge_num: int) -> np.ndarray:
+    """
+    模拟B-rep中顶点被多条边共享的情况，顶点数约为边数的2/3
+    """
+    corner_num = max(1, edge_num * 2 // 3)
+    corners = np.random.rand(corner_num, 3) * 100.0
+    corner_idxs = np.random.randint(0, corner_num, size=(edge_num, 2))
+    # 加入小于取整精度的扰动
+    noise = (np.random.rand(edge_num, 2, 3) - 0.5) * 1e-6
+    return corners[corner_idxs] + noise
+
+
+def benchmark(edge_num_list: list = [100, 1000, 5000]) -> list:
+    result_list = []
+    for edge_num in edge_num_list:
+        edge_corner_pnts = create_edge_corner_pnts(edge_num)
+
+        start = time()
+        loop_corner_unique, loop_edgeCorner_IncM = merge_corners_loop(edge_corner_pnts)
+        loop_spend = time() - start
+
+        start = time()
+        corner_unique, edgeCorner_IncM = merge_corners(edge_corner_pnts)
+        spend = time() - start
+
+        same = np.array_equal(loop_corner_unique, corner_unique) and \
+            np.array_equal(loop_edgeCorner_IncM, edgeCorner_IncM)
+
+        result = {
+            'edge_num': edge_num,
+            'corner_num': int(corner_unique.shape[0]),
+            'loop_second': loop_spend,
+            'unique_second': spend,
+            'speedup': loop_spend / max(spend, 1e-9),
+            'same': bool(same),
+        }
+        result_list.append(result)
+
+        print('[INFO][corner_dedup::benchmark]')
+        print('\t edge_num: %d, corner_num: %d, loop: %.4fs, unique: %.4fs, speedup: %.1fx, same: %s' % (
+            edge_num, result['corner_num'], loop_spend, spend, result['speedup'], same))
+
+    return result_list
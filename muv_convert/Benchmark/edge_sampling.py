@@ -0,0 +1,63 @@
+import numpy as np
+from time import time
+from occwl.uvgrid import ugrid
+from occwl.solid import Solid
+
+from muv_convert.Method.sample import sample_edges
+from muv_convert.Method.convert_utils import split_closed_shape, face_edge_adj, update_mapping
+from muv_convert.Benchmark.pipeline import create_benchmark_shapes
+
+
+def sample_edges_ugrid(edge_dict: dict, num_u: int = 32):
+    """
+    原有的逐边occwl.ugrid采样实现，端点取采样点的首尾，仅用于对比
+    """
+    edge_pnts = []
+    edge_corner_pnts = []
+    for edge in edge_dict.values():
+        points = ugrid(edge, method="point", num_u=num_u)
+        edge_pnts.append(points)
+        edge_corner_pnts.append((points[0], points[-1]))
+
+    if len(edge_pnts) == 0:
+        return np.array([]).reshape(0, num_u, 3), np.array([]).reshape(0, 2, 3)
+    return np.stack(edge_pnts), np.stack(edge_corner_pnts)
+
+
+def benchmark(num_u: int = 32, repeat_num: int = 3) -> list:
+    result_list = []
+    for name, shape in create_benchmark_shapes().items():
+        shape_obj = split_closed_shape(Solid(shape))
+        _, edge_dict, _ = face_edge_adj(shape_obj)
+        edge_dict, _ = update_mapping(edge_dict)
+
+        ugrid_spend = float('inf')
+        spend = float('inf')
+        for _ in range(repeat_num):
+            start = time()
+            ugrid_edge_pnts, ugrid_edge_corner_pnts = sample_edges_ugrid(edge_dict, num_u)
+            ugrid_spend = min(ugrid_spend, time() - start)
+
+            start = time()
+            edge_pnts, edge_corner_pnts = sample_edges(edge_dict, num_u)
+            spend = min(spend, time() - start)
+
+        result = {
+            'case': name,
+            'edge_num': len(edge_dict),
+            'ugrid_second': ugrid_spend,
+            'analytic_second': spend,
+            'speedup': ugrid_spend / max(spend, 1e-9),
+            'max_point_error': float(np.abs(ugrid_edge_pnts - edge_pnts).max()) if len(edge_dict) > 0 else 0.0,
+            'max_corner_error': float(np.abs(ugrid_edge_corner_pnts - edge_corner_pnts).max())
+            if len(edge_dict) > 0 else 0.0,
+        }
+        result_list.append(result)
+
+        print('[INFO][edge_sampling::benchmark]')
+        print('\t case: %s, edge_num: %d, ugrid: %.4fs, analytic: %.4fs, speedup: %.1fx' % (
+            name, result['edge_num'], ugrid_spend, spend, result['speedup']))
+        print('\t max point error: %.2e, max corner error: %.2e' % (
+            result['max_point_error'], result['max_corner_error']))
+
+    return result_list
@@ -0,0 +1,87 @@
+from time import time
+from typing import Union
+from occwl.solid import Solid
+from occwl.shell import Shell
+from occwl.compound import Compound
+from occwl.entity_mapper import EntityMapper
+
+from muv_convert.Method.convert_utils import split_closed_shape, face_edge_adj
+from muv_convert.Benchmark.pipeline import create_benchmark_shapes, make_perforated_plate
+
+
+def face_edge_adj_legacy(shape: Union[Shell, Solid, Compound]):
+    """
+    原有的逐边调用faces_from_edge的实现，仅用于对比
+    """
+    assert isinstance(shape, (Shell, Solid, Compound))
+    mapper = EntityMapper(shape)
+
+    face_dict = {}
+    for face in shape.faces():
+        face_idx = mapper.face_index(face)
+        face_dict[face_idx] = (face.surface_type(), face)
+
+    edgeFace_IncM = {}
+    edge_dict = {}
+    for edge in shape.edges():
+        if not edge.has_curve():
+            continue
+
+        connected_faces = list(shape.faces_from_edge(edge))
+        if len(connected_faces) == 2 and not edge.seam(connected_faces[0]) and not edge.seam(connected_faces[1]):
+            left_face, right_face = edge.find_left_and_right_faces(connected_faces)
+            if left_face is None or right_face is None:
+                continue
+            edge_idx = mapper.edge_index(edge)
+            edge_dict[edge_idx] = edge
+            left_index = mapper.face_index(left_face)
+            right_index = mapper.face_index(right_face)
+
+            if edge_idx in edgeFace_IncM:
+                edgeFace_IncM[edge_idx] += [left_index, right_index]
+            else:
+                edgeFace_IncM[edge_idx] = [left_index, right_index]
+
+    return face_dict, edge_dict, edgeFace_IncM
+
+
+def benchmark(repeat_num: int = 3, hole_num_per_axis_list: list = [12, 24]) -> list:
+    shape_dict = create_benchmark_shapes()
+    for hole_num_per_axis in hole_num_per_axis_list:
+        shape_dict['perforated_plate_%d' % hole_num_per_axis] = make_perforated_plate(hole_num_per_axis)
+
+    result_list = []
+    for name, shape in shape_dict.items():
+        shape_obj = split_closed_shape(Solid(shape))
+
+        legacy_spend = float('inf')
+        spend = float('inf')
+        for _ in range(repeat_num):
+            start = time()
+            legacy_face_dict, legacy_edge_dict, legacy_edgeFace_IncM = face_edge_adj_legacy(shape_obj)
+            legacy_spend = min(legacy_spend, time() - start)
+
+            start = time()
+            face_dict, edge_dict, edgeFace_IncM = face_edge_adj(shape_obj)
+            spend = min(spend, time() - start)
+
+        same = list(legacy_face_dict.keys()) == list(face_dict.keys()) and \
+            sorted(legacy_edge_dict.keys()) == sorted(edge_dict.keys()) and \
+            legacy_edgeFace_IncM == edgeFace_IncM
+
+        result = {
+            'case': name,
+            'face_num': len(face_dict),
+            'edge_num': len(edge_dict),
+            'legacy_second': legacy_spend,
+            'single_pass_second': spend,
+            'speedup': legacy_spend / max(spend, 1e-9),
+            'same': bool(same),
+        }
+        result_list.append(result)
+
+        print('[INFO][face_edge_adj::benchmark]')
+        print('\t case: %s, faces: %d, edges: %d, legacy: %.4fs, single pass: %.4fs, speedup: %.1fx, same: %s' % (
+            name, result['face_num'], result['edge_num'], legacy_spend, spend, result['speedup'], same))
+
+    return result_list
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import subprocess
+
+
+# 需要按需加载的重依赖
+HEAVY_MODULE_LIST = ['OCC', 'occwl', 'open3d']
+
+MODULE_LIST = [
+    'muv_convert.Method.pkl',
+    'muv_convert.Method.storage',
+    'muv_convert.Module.muv_dataset',
+    'muv_convert.Module.shard_reader',
+    'muv_convert.Module.thumbnail_renderer',
+    'muv_convert.Module.step_loader',
+    'muv_convert.Module.muv_convertor',
+    'muv_convert.Method.render',
+]
+
+IMPORT_CODE = '''
+import sys
+import json
+from time import perf_counter
+start = perf_counter()
+import {module}
+spend = perf_counter() - start
+try:
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak_rss *= 1024
+except ImportError:
+    peak_rss = -1
+print(json.dumps({{
+    'second': spend,
+    'peak_rss': peak_rss,
+    'heavy_modules': [name for name in {heavy_module_list} if name in sys.modules],
+}}))
+'''
+
+
+def measure_import(module: str) -> dict:
+    """
+    在新的Python进程中导入模块，测量导入耗时、进程峰值内存和加载的重依赖
+
+    Returns:
+        result: 导入失败时包含'error'
+    """
+    root_folder_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    code = IMPORT_CODE.format(module=module, heavy_module_list=HEAVY_MODULE_LIST)
+
+    process = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=root_folder_path,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if process.returncode != 0:
+        error_line_list = process.stderr.decode().strip().splitlines()
+        return {'error': error_line_list[-1] if len(error_line_list) > 0 else 'exitcode: ' + str(process.returncode)}
+
+    return json.loads(process.stdout.decode().strip().splitlines()[-1])
+
+
+def benchmark(repeat_num: int = 3, module_list: list = MODULE_LIST) -> dict:
+    """
+    每个模块取repeat_num次中的最小导入耗时
+    """
+    result_dict = {}
+    for module in module_list:
+        result = None
+        for _ in range(repeat_num):
+            run_result = measure_import(module)
+            if 'error' in run_result:
+                result = run_result
+                break
+            if result is None or run_result['second'] < result['second']:
+                result = run_result
+
+        result_dict[module] = result
+
+        print('[INFO][import_time::benchmark]')
+        if 'error' in result:
+            print('\t %s: import failed, %s' % (module, result['error']))
+            continue
+
+        print('\t %s: %.3fs, peak rss: %.1fMB, heavy modules: %s' % (
+            module, result['second'], result['peak_rss'] / 1024.0 / 1024.0,
+            ', '.join(result['heavy_modules']) if len(result['heavy_modules']) > 0 else 'none'))
+
+    return result_dict
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import platform
+import tempfile
+import subprocess
+from time import perf_counter
+
+from occwl.solid import Solid
+from OCC.Core.gp import gp_Ax2, gp_Pnt, gp_Dir
+from OCC.Core.TopAbs import TopAbs_EDGE
+from OCC.Core.TopExp import TopExp_Explorer
+from OCC.Core.TopoDS import topods_Edge
+from OCC.Core.BRepAlgoAPI import BRepAlgoAPI_Cut, BRepAlgoAPI_Fuse
+from OCC.Core.BRepFilletAPI import BRepFilletAPI_MakeFillet
+from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeCylinder, BRepPrimAPI_MakeSphere
+
+from muv_convert.Method.convert import write_step_file
+from muv_convert.Method.instrument import aggregate_records
+from muv_convert.Module.muv_convertor import MUVConvertor
+
+
+def make_box():
+    return Solid.make_box(10, 10, 10).topods_shape()
+
+
+def make_cylinder():
+    return BRepPrimAPI_MakeCylinder(gp_Ax2(gp_Pnt(0, 0, 0), gp_Dir(0, 0, 1)), 5.0, 10.0).Shape()
+
+
+def make_sphere():
+    return BRepPrimAPI_MakeSphere(5.0).Shape()
+
+
+def make_filleted_box():
+    box = make_box()
+    fillet = BRepFilletAPI_MakeFillet(box)
+    exp_edge = TopExp_Explorer(box, TopAbs_EDGE)
+    while exp_edge.More():
+        fillet.Add(1.0, topods_Edge(exp_edge.Current()))
+        exp_edge.Next()
+    return fillet.Shape()
+
+
+def make_boolean():
+    box = make_box()
+    cylinder = BRepPrimAPI_MakeCylinder(gp_Ax2(gp_Pnt(5, 5, -1), gp_Dir(0, 0, 1)), 3.0, 12.0).Shape()
+    sphere = BRepPrimAPI_MakeSphere(gp_Pnt(10, 10, 10), 4.0).Shape()
+    shape = BRepAlgoAPI_Cut(box, cylinder).Shape()
+    return BRepAlgoAPI_Cut(shape, sphere).Shape()
+
+
+def make_perforated_plate(hole_num_per_axis: int = 12):
+    """
+    开有hole_num_per_axis^2个圆孔的板，用于测试高面数零件
+    """
+    size = 2.0 * hole_num_per_axis
+    plate = Solid.make_box(size, size, 2.0).topods_shape()
+
+    tools = None
+    for i in range(hole_num_per_axis):
+        for j in range(hole_num_per_axis):
+            center = gp_Pnt(2.0 * i + 1.0, 2.0 * j + 1.0, -1.0)
+            cylinder = BRepPrimAPI_MakeCylinder(gp_Ax2(center, gp_Dir(0, 0, 1)), 0.6, 4.0).Shape()
+            tools = cylinder if tools is None else BRepAlgoAPI_Fuse(tools, cylinder).Shape()
+
+    return BRepAlgoAPI_Cut(plate, tools).Shape()
+
+
+def create_benchmark_shapes() -> dict:
+    return {
+        'box': make_box(),
+        'cylinder': make_cylinder(),
+        'sphere': make_sphere(),
+        'filleted_box': make_filleted_box(),
+        'boolean': make_boolean(),
+        'perforated_plate': make_perforated_plate(),
+    }
+
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except Exception:
+        return ''
+
+
+def benchmark_step_file(
+    step_file_path: str,
+    face_num_u: int = 32,
+    face_num_v: int = 32,
+    edge_num_u: int = 32,
+) -> dict:
+    """
+    使用MUVConvertor完整转换一次，各阶段耗时取自Method.instrument的记录，与实际转换流程一致
+
+    Returns:
+        result: {'face_num', 'edge_num', 'total': 总耗时（秒）, 'record': stop_record的结果}
+    """
+    muv_convertor = MUVConvertor(
+        face_num_u=face_num_u,
+        face_num_v=face_num_v,
+        edge_num_u=edge_num_u,
+        instrument=True,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        save_pkl_file_path = os.path.join(tmp_folder_path, 'shape.pkl')
+
+        start = perf_counter()
+        muv_convertor.convertStepFile(step_file_path, save_pkl_file_path, overwrite=True)
+        spend = perf_counter() - start
+
+    convert_info = muv_convertor.convert_info
+    return {
+        'face_num': convert_info['face_num'],
+        'edge_num': convert_info['edge_num'],
+        'total': spend,
+        'record': convert_info['profile'],
+    }
+
+
+def benchmark(
+    save_json_file_path: str = None,
+    repeat_num: int = 3,
+    face_num_u: int = 32,
+    face_num_v: int = 32,
+    edge_num_u: int = 32,
+) -> dict:
+    """
+    在合成的实体上运行完整转换流程，每个阶段取repeat_num次的中位数耗时，总耗时取最小值
+    结果以JSON保存，可在不同提交之间比较
+
+    Args:
+        save_json_file_path: 结果保存路径，None表示只打印
+        repeat_num: 重复次数
+    """
+    result = {
+        'commit': get_git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat_num': repeat_num,
+        'face_num_u': face_num_u,
+        'face_num_v': face_num_v,
+        'edge_num_u': edge_num_u,
+        'cases': {},
+    }
+
+    shape_dict = create_benchmark_shapes()
+
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        for name, shape in shape_dict.items():
+            step_file_path = os.path.join(tmp_folder_path, name + '.step')
+            if not write_step_file(shape, step_file_path):
+                print('[ERROR][pipeline::benchmark]')
+                print('\t write_step_file failed!')
+                print('\t case:', name)
+                continue
+
+            run_result_list = [
+                benchmark_step_file(step_file_path, face_num_u, face_num_v, edge_num_u)
+                for _ in range(repeat_num)
+            ]
+
+            # 嵌套阶段的耗时同时计入外层阶段，如face_sampling计入extract_geometry_data和parse_shape
+            summary = aggregate_records([run_result['record'] for run_result in run_result_list])
+            case_result = {
+                'face_num': run_result_list[0]['face_num'],
+                'edge_num': run_result_list[0]['edge_num'],
+                'total': min(run_result['total'] for run_result in run_result_list),
+                'stages': {
+                    stage_name: stage_summary['p50'] for stage_name, stage_summary in summary['stages'].items()
+                },
+                'summary': summary,
+            }
+            result['cases'][name] = case_result
+
+            print('[INFO][pipeline::benchmark]')
+            print('\t case: %s, faces: %d, edges: %d, total: %.4fs' % (
+                name, case_result['face_num'], case_result['edge_num'], case_result['total']))
+            for key, value in case_result['stages'].items():
+                print('\t\t %s: p50 %.4fs' % (key, value))
+
+    if save_json_file_path is not None:
+        save_folder_path = os.path.dirname(save_json_file_path)
+        if save_folder_path != '':
+            os.makedirs(save_folder_path, exist_ok=True)
+        with open(save_json_file_path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    return result
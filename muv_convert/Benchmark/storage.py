@@ -0,0 +1,120 @@
+import os
+import tempfile
+import numpy as np
+from time import time
+from typing import Union
+
+from muv_convert.Method.pkl import load_pkl_file
+from muv_convert.Method.storage import BACKEND_EXT_DICT, zstandard, save_shape_file, load_shape_file
+
+
+def create_shape_data(face_num: int, edge_num: int, num_u: int = 32, num_v: int = 32, edge_num_u: int = 32) -> dict:
+    """
+    生成与parse_shape输出格式相同的合成数据，面为光滑曲面片，边为圆弧
+    """
+    u = np.linspace(0.0, 1.0, num_u)
+    v = np.linspace(0.0, 1.0, num_v)
+    uu, vv = np.meshgrid(u, v, indexing='ij')
+
+    offsets = np.random.rand(face_num, 1, 1, 3) * 100.0
+    scales = np.random.rand(face_num, 1, 1, 1) * 10.0 + 1.0
+    face_xyz = np.stack([uu, vv, np.sin(uu * np.pi) * np.cos(vv * np.pi)], axis=-1)[None] * scales + offsets
+
+    # 模拟裁剪面，部分采样点在面外
+    face_mask = (uu + vv <= 1.5)[None].repeat(face_num, axis=0)
+    face_pnts = np.concatenate([face_xyz, face_mask[..., None]], axis=-1)
+
+    t = np.linspace(0.0, np.pi, edge_num_u)
+    radius = np.random.rand(edge_num, 1) * 5.0 + 1.0
+    centers = np.random.rand(edge_num, 1, 3) * 100.0
+    edge_pnts = np.stack([np.cos(t)[None] * radius, np.sin(t)[None] * radius, np.zeros((edge_num, edge_num_u))],
+                         axis=-1) + centers
+
+    edgeFace_adj = np.random.randint(0, face_num, size=(edge_num, 2))
+    corner_num = max(1, edge_num * 2 // 3)
+
+    return {
+        'type': 'Solid',
+        'data': {
+            'face_pnts': face_pnts.astype(np.float32),
+            'edge_pnts': edge_pnts.astype(np.float32),
+            'edge_corner_pnts': edge_pnts[:, [0, -1]].astype(np.float32),
+            'edgeFace_adj': edgeFace_adj,
+            'edgeCorner_adj': np.random.randint(0, corner_num, size=(edge_num, 2)),
+            'faceEdge_indptr': np.linspace(0, 2 * edge_num, face_num + 1).astype(np.int64),
+            'faceEdge_indices': np.random.randint(0, edge_num, size=2 * edge_num),
+            'corner_unique': (np.random.rand(corner_num, 3) * 100.0).astype(np.float32),
+        },
+    }
+
+
+def get_array_bytes(shape_data_list: list) -> int:
+    return sum(
+        value.nbytes
+        for shape_data in shape_data_list
+        for value in shape_data['data'].values()
+        if isinstance(value, np.ndarray)
+    )
+
+
+def benchmark(
+    pkl_file_path_list: Union[list, None] = None,
+    repeat_num: int = 3,
+    backend_list: list = ['pkl', 'npz', 'zstd'],
+) -> dict:
+    """
+    比较各存储格式的写入速度、读取速度和文件大小，每项取repeat_num次中的最小耗时
+
+    Args:
+        pkl_file_path_list: 用于测试的已转换pkl文件，None表示使用合成数据
+    """
+    if pkl_file_path_list is None:
+        shape_data_list = [create_shape_data(face_num, face_num * 3) for face_num in [10, 50, 200]]
+    else:
+        shape_data_list = []
+        for pkl_file_path in pkl_file_path_list:
+            pkl_shape_data_list = load_pkl_file(pkl_file_path)
+            if pkl_shape_data_list is not None:
+                shape_data_list += pkl_shape_data_list
+
+    array_bytes = get_array_bytes(shape_data_list)
+    array_mb = array_bytes / 1024.0 / 1024.0
+
+    result_dict = {}
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        for backend in backend_list:
+            if backend == 'zstd' and zstandard is None:
+                print('[WARN][storage::benchmark]')
+                print('\t zstandard not installed, skip zstd backend')
+                continue
+
+            file_path = os.path.join(tmp_folder_path, 'shapes' + BACKEND_EXT_DICT[backend])
+
+            write_spend = float('inf')
+            read_spend = float('inf')
+            for _ in range(repeat_num):
+                start = time()
+                save_shape_file(shape_data_list, file_path, backend)
+                write_spend = min(write_spend, time() - start)
+
+                start = time()
+                load_shape_file(file_path, backend)
+                read_spend = min(read_spend, time() - start)
+
+            file_bytes = os.path.getsize(file_path)
+            result = {
+                'file_bytes': file_bytes,
+                'ratio': array_bytes / max(file_bytes, 1),
+                'write_second': write_spend,
+                'read_second': read_spend,
+                'write_mb_per_second': array_mb / max(write_spend, 1e-9),
+                'read_mb_per_second': array_mb / max(read_spend, 1e-9),
+            }
+            result_dict[backend] = result
+
+            print('[INFO][storage::benchmark]')
+            print('\t backend: %s, size: %.2fMB, ratio: %.2fx, write: %.1fMB/s, read: %.1fMB/s' % (
+                backend, file_bytes / 1024.0 / 1024.0, result['ratio'],
+                result['write_mb_per_second'], result['read_mb_per_second']))
+
+    return result_dict
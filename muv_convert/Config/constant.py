@@ -1 +1,7 @@
 MAX_FACE = 70
+
+# 转换结果格式或算法变化时递增，用于使增量转换的缓存失效
+CONVERTER_VERSION = '1'
+
+# 紧凑输出格式的版本，旧格式（face_pnts带mask通道、int64索引）视为版本1
+SCHEMA_VERSION = 2
@@ -0,0 +1,19 @@
+import os
+
+from muv_convert.Config.constant import MAX_FACE
+from muv_convert.Module.muv_convertor import MUVConvertor
+
+def demo():
+    step_root_folder_path = "/Users/chli/chLi/Dataset/ABC/step/"
+    save_pkl_root_folder_path = "/Users/chli/chLi/Dataset/ABC/pkl/"
+    workers = os.cpu_count()
+    overwrite = False
+
+    muv_convertor = MUVConvertor(max_face_num=MAX_FACE)
+    muv_convertor.convertDataset(
+        step_root_folder_path,
+        save_pkl_root_folder_path,
+        workers,
+        overwrite,
+    )
+    return True
@@ -0,0 +1,19 @@
+import numpy as np
+
+from muv_convert.Module.muv_dataset import MUVDataset
+
+def demo():
+    data_root_folder_path = "/Users/chli/chLi/Dataset/ABC/pkl/"
+    key_list = ['face_pnts', 'edge_pnts', 'edgeFace_adj']
+
+    muv_dataset = MUVDataset(data_root_folder_path, key_list=key_list)
+
+    print('shape num:', len(muv_dataset))
+    for i in range(min(len(muv_dataset), 10)):
+        shape_data = muv_dataset[i]
+        print('==== shape', i, '====')
+        print('info:', muv_dataset.getShapeInfo(i))
+        for key, value in shape_data['data'].items():
+            if isinstance(value, np.ndarray):
+                print(key, value.shape)
+    return True
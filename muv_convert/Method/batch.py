@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import multiprocessing as mp
+from time import time
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def find_files(root_folder_path: str, ext_list: list) -> list:
+    """
+    递归查找文件夹下所有指定后缀的文件
+
+    Args:
+        root_folder_path: 根文件夹路径
+        ext_list: 文件后缀列表，如 ['.step', '.stp']，不区分大小写
+
+    Returns:
+        rel_file_path_list: 相对于root_folder_path的文件路径列表（已排序）
+    """
+    ext_list = [ext.lower() for ext in ext_list]
+
+    rel_file_path_list = []
+    for root, _, files in os.walk(root_folder_path):
+        for file in files:
+            if os.path.splitext(file)[1].lower() not in ext_list:
+                continue
+
+            file_path = os.path.join(root, file)
+            rel_file_path_list.append(os.path.relpath(file_path, root_folder_path))
+
+    rel_file_path_list.sort()
+    return rel_file_path_list
+
+
+def get_peak_rss() -> int:
+    """
+    当前进程的峰值常驻内存（字节），不支持的平台返回-1
+    """
+    if resource is None:
+        return -1
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux下单位为KB，macOS下单位为字节
+    if sys.platform != 'darwin':
+        peak_rss *= 1024
+    return peak_rss
+
+
+def _run_task(conn, task_func, task_args, memory_limit):
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    try:
+        result = task_func(*task_args)
+        conn.send(('ok', result, get_peak_rss()))
+    except MemoryError as e:
+        conn.send(('memory_error', repr(e), get_peak_rss()))
+    except Exception as e:
+        conn.send(('error', repr(e), get_peak_rss()))
+    conn.close()
+
+
+def run_isolated_tasks(
+    task_func,
+    task_args_list: list,
+    workers: int = 1,
+    timeout: float = None,
+    memory_limit: int = None,
+):
+    """
+    将每个任务放在独立的子进程中执行，最多同时运行workers个子进程
+    子进程崩溃（如OCC段错误）、超时或超出内存限制只会使当前任务失败，不影响其他任务
+
+    Args:
+        task_func: 模块级函数，子进程中以task_func(*task_args)调用
+        task_args_list: 每个任务的参数元组列表
+        workers: 最大并行子进程数
+        timeout: 每个任务的最长运行时间（秒），超时的子进程会被强制结束，None表示不限制
+        memory_limit: 每个子进程的虚拟内存上限（字节），None表示不限制，仅Unix有效
+
+    Yields:
+        (task_idx, status, result, run_info): 按完成顺序返回
+            - status: 'ok' 正常返回, 'error' 抛出异常, 'memory_error' 内存不足,
+                      'timeout' 超时, 'crash' 子进程异常退出
+            - result: 'ok'时为task_func的返回值，异常时为异常信息，'crash'时为退出码
+            - run_info: {'duration': 运行时间（秒）, 'peak_rss': 子进程峰值内存（字节），未知时为None}
+    """
+    ctx = mp.get_context()
+    workers = max(1, workers)
+
+    next_task_idx = 0
+    running = {}
+    try:
+        while next_task_idx < len(task_args_list) or len(running) > 0:
+            while next_task_idx < len(task_args_list) and len(running) < workers:
+                recv_conn, send_conn = ctx.Pipe(duplex=False)
+                process = ctx.Process(
+                    target=_run_task,
+                    args=(send_conn, task_func, task_args_list[next_task_idx], memory_limit),
+                )
+                process.start()
+                send_conn.close()
+
+                running[next_task_idx] = {
+                    'process': process,
+                    'conn': recv_conn,
+                    'message': None,
+                    'start': time(),
+                }
+                next_task_idx += 1
+
+            wait_dict = {}
+            for task_idx, task in running.items():
+                wait_dict[task['process'].sentinel] = task_idx
+                if task['conn'] is not None:
+                    wait_dict[task['conn']] = task_idx
+
+            wait_second = None
+            if timeout is not None:
+                deadline_list = [
+                    task['start'] + timeout for task in running.values() if task['message'] is None
+                ]
+                if len(deadline_list) > 0:
+                    wait_second = max(0.0, min(deadline_list) - time())
+
+            ready_list = wait(list(wait_dict.keys()), wait_second)
+
+            # 先读取子进程返回的结果，避免大结果阻塞子进程退出
+            for ready in ready_list:
+                task = running[wait_dict[ready]]
+                if ready is not task['conn']:
+                    continue
+
+                try:
+                    task['message'] = task['conn'].recv()
+                except EOFError:
+                    pass
+                task['conn'].close()
+                task['conn'] = None
+
+            finished_task_idx_list = []
+            for ready in ready_list:
+                task_idx = wait_dict[ready]
+                if ready is running[task_idx]['process'].sentinel:
+                    finished_task_idx_list.append(task_idx)
+
+            if timeout is not None:
+                now = time()
+                for task_idx, task in running.items():
+                    if task_idx in finished_task_idx_list:
+                        continue
+                    if now - task['start'] >= timeout and task['message'] is None:
+                        task['process'].kill()
+                        task['timeout'] = True
+                        finished_task_idx_list.append(task_idx)
+
+            for task_idx in finished_task_idx_list:
+                task = running.pop(task_idx)
+
+                process = task['process']
+                process.join()
+                duration = time() - task['start']
+
+                if task['conn'] is not None:
+                    if task['message'] is None and task['conn'].poll():
+                        try:
+                            task['message'] = task['conn'].recv()
+                        except EOFError:
+                            pass
+                    task['conn'].close()
+
+                if task.get('timeout', False):
+                    yield task_idx, 'timeout', None, {'duration': duration, 'peak_rss': None}
+                    continue
+
+                if task['message'] is None:
+                    yield task_idx, 'crash', process.exitcode, {'duration': duration, 'peak_rss': None}
+                    continue
+
+                status, result, peak_rss = task['message']
+                if peak_rss < 0:
+                    peak_rss = None
+                yield task_idx, status, result, {'duration': duration, 'peak_rss': peak_rss}
+    finally:
+        for task in running.values():
+            if task['process'].is_alive():
+                task['process'].kill()
+            task['process'].join()
+            if task['conn'] is not None:
+                task['conn'].close()
+
+
+def append_manifest_record(manifest_file_path: str, record: dict) -> bool:
+    """
+    以JSONL格式追加一条记录到清单文件
+    """
+    manifest_folder_path = os.path.dirname(manifest_file_path)
+    if manifest_folder_path != '':
+        os.makedirs(manifest_folder_path, exist_ok=True)
+
+    with open(manifest_file_path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    return True
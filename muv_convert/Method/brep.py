@@ -0,0 +1,57 @@
+import os
+import tempfile
+from OCC.Core.BRep import BRep_Builder
+from OCC.Core.TopoDS import TopoDS_Shape
+from OCC.Core.BRepTools import breptools_Write, breptools_Read
+from OCC.Core.BinTools import bintools_Write, bintools_Read
+
+
+def shape_to_brep_string(shape: TopoDS_Shape) -> str:
+    """
+    将TopoDS_Shape序列化为BREP文本，用于在进程间传递形状
+    """
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        brep_file_path = os.path.join(tmp_folder_path, 'shape.brep')
+        breptools_Write(shape, brep_file_path)
+        with open(brep_file_path, 'r') as f:
+            brep_str = f.read()
+    return brep_str
+
+
+def brep_string_to_shape(brep_str: str) -> TopoDS_Shape:
+    """
+    由BREP文本恢复TopoDS_Shape
+    """
+    shape = TopoDS_Shape()
+    with tempfile.TemporaryDirectory() as tmp_folder_path:
+        brep_file_path = os.path.join(tmp_folder_path, 'shape.brep')
+        with open(brep_file_path, 'w') as f:
+            f.write(brep_str)
+        breptools_Read(shape, brep_file_path, BRep_Builder())
+    return shape
+
+
+def write_bin_brep_file(shape: TopoDS_Shape, save_brep_file_path: str) -> bool:
+    """
+    以OCC二进制BREP格式保存TopoDS_Shape，读取速度远快于STEP解析
+    """
+    return bool(bintools_Write(shape, save_brep_file_path))
+
+
+def read_bin_brep_file(brep_file_path: str):
+    """
+    读取OCC二进制BREP文件，失败时返回None
+    """
+    if not os.path.exists(brep_file_path):
+        print('[ERROR][brep::read_bin_brep_file]')
+        print('\t brep file not exist!')
+        print('\t brep_file_path:', brep_file_path)
+        return None
+
+    shape = TopoDS_Shape()
+    if not bintools_Read(shape, brep_file_path):
+        print('[ERROR][brep::read_bin_brep_file]')
+        print('\t bintools_Read failed!')
+        print('\t brep_file_path:', brep_file_path)
+        return None
+    return shape
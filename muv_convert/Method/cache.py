@@ -0,0 +1,116 @@
+import os
+import json
+import hashlib
+
+from muv_convert.Config.constant import CONVERTER_VERSION
+from muv_convert.Method.path import createFileFolder, getTmpFilePath, removeFile, removeTmpFiles, renameFile
+
+
+def hash_file(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    计算文件内容的sha256
+    """
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def create_convert_key(step_hash: str, params: dict) -> str:
+    """
+    由STEP文件内容、转换器版本和转换参数生成缓存键
+    """
+    key_str = json.dumps({
+        'step_hash': step_hash,
+        'version': CONVERTER_VERSION,
+        'params': params,
+    }, sort_keys=True)
+    return hashlib.sha256(key_str.encode('utf-8')).hexdigest()
+
+
+def get_key_file_path(save_file_path: str) -> str:
+    return save_file_path + '.key.json'
+
+
+def load_key_info(save_file_path: str):
+    key_file_path = get_key_file_path(save_file_path)
+    if not os.path.exists(key_file_path):
+        return None
+
+    try:
+        with open(key_file_path, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def create_key_info(step_file_path: str, params: dict, prev_key_info=None) -> dict:
+    """
+    计算STEP文件的缓存键信息
+    文件大小和修改时间未变化时复用prev_key_info中的内容哈希，避免重复读取大文件
+
+    Returns:
+        key_info: {'key', 'step_hash', 'step_size', 'step_mtime_ns'}
+    """
+    stat = os.stat(step_file_path)
+
+    step_hash = None
+    if prev_key_info is not None and \
+            prev_key_info.get('step_size') == stat.st_size and \
+            prev_key_info.get('step_mtime_ns') == stat.st_mtime_ns:
+        step_hash = prev_key_info.get('step_hash')
+
+    if step_hash is None:
+        step_hash = hash_file(step_file_path)
+
+    return {
+        'key': create_convert_key(step_hash, params),
+        'step_hash': step_hash,
+        'step_size': stat.st_size,
+        'step_mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def check_convert_cache(step_file_path: str, save_file_path: str, params: dict):
+    """
+    检查save_file_path是否为当前STEP文件和参数下完整写入的转换结果
+
+    Returns:
+        (is_valid, key_info): 缓存是否有效，以及当前的缓存键信息
+            结果文件或缓存键文件不存在时直接返回(False, None)，不读取STEP文件计算哈希
+    """
+    prev_key_info = load_key_info(save_file_path)
+    if prev_key_info is None or not os.path.exists(save_file_path):
+        return False, None
+
+    key_info = create_key_info(step_file_path, params, prev_key_info)
+    return prev_key_info.get('key') == key_info['key'], key_info
+
+
+def save_key_info(save_file_path: str, key_info: dict) -> bool:
+    key_file_path = get_key_file_path(save_file_path)
+    createFileFolder(key_file_path)
+
+    tmp_key_file_path = getTmpFilePath(key_file_path)
+    with open(tmp_key_file_path, 'w') as f:
+        json.dump(key_info, f)
+
+    renameFile(tmp_key_file_path, key_file_path, overwrite=True)
+    return True
+
+
+def remove_key_info(save_file_path: str) -> bool:
+    return removeFile(get_key_file_path(save_file_path))
+
+
+def remove_tmp_files(save_file_path: str) -> bool:
+    """
+    删除转换中途被终止时留下的结果临时文件和缓存键临时文件
+    """
+    removeTmpFiles(save_file_path)
+    removeTmpFiles(get_key_file_path(save_file_path))
+    return True
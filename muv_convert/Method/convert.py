@@ -3,54 +3,86 @@ from OCC.Core.IGESControl import IGESControl_Reader
 from OCC.Core.STEPControl import STEPControl_Writer, STEPControl_AsIs
 from OCC.Core.Interface import Interface_Static
 
-from muv_convert.Method.path import createFileFolder, removeFile
+from muv_convert.Method.path import createFileFolder, getTmpFilePath, removeFile, renameFile
 
 
-def igs_to_step(
-    igs_file_path: str,
-    save_step_file_path: str,
-    overwrite: bool = False,
-) -> bool:
-    if not os.path.exists(igs_file_path):
-        print('[ERROR][convert::igs_to_step]')
-        print('\t igs file not exist!')
-        print('\t igs_file_path:', igs_file_path)
-        return False
+def load_igs_file(igs_file_path: str):
+    """
+    使用pythonocc-core读取IGES文件
 
-    if os.path.exists(save_step_file_path):
-        if not overwrite:
-            return True
-
-        removeFile(save_step_file_path)
+    Args:
+        igs_file_path: IGES文件路径
 
+    Returns:
+        shape: 顶层TopoDS_Shape，读取失败时返回None
+    """
     # Load IGES file
     iges_reader = IGESControl_Reader()
     status = iges_reader.ReadFile(igs_file_path)
 
     if status != 1:
-        print('[ERROR][convert::igs_to_step]')
+        print('[ERROR][convert::load_igs_file]')
         print(f"\t IGES file read error: status {status}")
-        return False
+        return None
 
     # Transfer all roots (import entire model)
     iges_reader.TransferRoots()
 
     # Retrieve the resulting shape
-    shape = iges_reader.OneShape()
+    return iges_reader.OneShape()
 
-    # STEP writer
-    step_writer = STEPControl_Writer()
+
+def write_step_file(shape, save_step_file_path: str) -> bool:
+    """
+    先写入临时文件再重命名，子进程超时或崩溃被终止时不会留下不完整的STEP文件
+    """
     Interface_Static.SetCVal("write.step.schema", "AP203")  # or AP214
 
+    # STEP writer
+    step_writer = STEPControl_Writer()
     step_writer.Transfer(shape, STEPControl_AsIs)
 
     createFileFolder(save_step_file_path)
 
-    status = step_writer.Write(save_step_file_path)
+    tmp_step_file_path = getTmpFilePath(save_step_file_path)
+    status = step_writer.Write(tmp_step_file_path)
 
     if status != 1:
-        print('[ERROR][convert::igs_to_step]')
+        print('[ERROR][convert::write_step_file]')
         print(f"\t Failed to write STEP: status {status}")
+        removeFile(tmp_step_file_path)
+        return False
+
+    renameFile(tmp_step_file_path, save_step_file_path, overwrite=True)
+    return True
+
+
+def igs_to_step(
+    igs_file_path: str,
+    save_step_file_path: str,
+    overwrite: bool = False,
+) -> bool:
+    if not os.path.exists(igs_file_path):
+        print('[ERROR][convert::igs_to_step]')
+        print('\t igs file not exist!')
+        print('\t igs_file_path:', igs_file_path)
+        return False
+
+    if os.path.exists(save_step_file_path):
+        if not overwrite:
+            return True
+
+        removeFile(save_step_file_path)
+
+    shape = load_igs_file(igs_file_path)
+    if shape is None:
+        print('[ERROR][convert::igs_to_step]')
+        print('\t load_igs_file failed!')
+        return False
+
+    if not write_step_file(shape, save_step_file_path):
+        print('[ERROR][convert::igs_to_step]')
+        print('\t write_step_file failed!')
         return False
 
     return True
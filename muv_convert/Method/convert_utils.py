@@ -3,28 +3,94 @@ from typing import Union
 from occwl.solid import Solid
 from occwl.shell import Shell
 from occwl.compound import Compound
-from occwl.uvgrid import ugrid, uvgrid
-from occwl.entity_mapper import EntityMapper
+from occwl.face import Face
+from occwl.edge import Edge
+from OCC.Core.TopExp import TopExp_Explorer, topexp_MapShapes
+from OCC.Core.TopAbs import TopAbs_FACE, TopAbs_EDGE
+from OCC.Core.TopoDS import topods_Face, topods_Edge
+from OCC.Core.TopTools import TopTools_IndexedMapOfShape
 
+from muv_convert.Method.normalize import get_bbox
+from muv_convert.Method.sample import sample_faces, sample_edges
+from muv_convert.Method.instrument import record_function, record_stage
 
-def get_bbox(point_cloud):
+
+def merge_corners(edge_corner_pnts, decimals: int = 4):
+    """
+    按decimals位小数取整后合并重复顶点，并构建边-顶点邻接关系
+    顶点按首次出现的顺序编号
+
+    Args:
+        edge_corner_pnts: (M, 2, 3) 边的起始和终止顶点
+        decimals: 合并顶点时保留的小数位数
+
+    Returns:
+        corner_unique: (K, 3) 去重后的顶点
+        edgeCorner_IncM: (M, 2) 边-顶点邻接关系
     """
-    Get the tighest fitting 3D bounding box giving a set of points (axis-aligned)
+    corner_pnts = np.round(np.asarray(edge_corner_pnts, dtype=np.float64), decimals).reshape(-1, 3)
+    if corner_pnts.shape[0] == 0:
+        return np.array([]).reshape(0, 3), np.array([]).reshape(0, 2)
+
+    # 加0.0将-0.0统一为0.0，与逐元素==比较的语义一致
+    corner_pnts = corner_pnts + 0.0
+
+    _, first_idxs, inverse = np.unique(corner_pnts, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # np.unique按字典序排序，重新按首次出现的顺序编号
+    order = np.argsort(first_idxs)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+
+    corner_unique = corner_pnts[first_idxs[order]]
+    edgeCorner_IncM = rank[inverse].reshape(-1, 2)
+    return corner_unique, edgeCorner_IncM
+
+def build_index_lut(keys) -> np.ndarray:
     """
-    # Find the minimum and maximum coordinates along each axis
-    min_x = np.min(point_cloud[:, 0])
-    max_x = np.max(point_cloud[:, 0])
+    构建旧索引到紧凑索引的查找表，未使用的旧索引映射为-1
+    紧凑索引即该键在所有键中的排序位置
+
+    Args:
+        keys: 非负整数索引，互不重复
+
+    Returns:
+        lut: (max(keys)+1,) 查找表，lut[old_idx] = new_idx
+    """
+    keys = np.asarray(list(keys), dtype=np.int64)
+    if keys.shape[0] == 0:
+        return np.array([], dtype=np.int64)
+
+    lut = np.full(keys.max() + 1, -1, dtype=np.int64)
+    sorted_keys = np.sort(keys)
+    lut[sorted_keys] = np.arange(sorted_keys.shape[0])
+    return lut
+
+def build_face_edge_csr(edgeFace_IncM, num_faces: int):
+    """
+    由边-面邻接矩阵一次性构建CSR格式的面-边邻接关系
+    面f的相邻边为indices[indptr[f]:indptr[f+1]]，边按编号升序排列
+
+    Args:
+        edgeFace_IncM: (M, 2) 边-面邻接矩阵
+        num_faces: 面数
 
-    min_y = np.min(point_cloud[:, 1])
-    max_y = np.max(point_cloud[:, 1])
+    Returns:
+        indptr: (num_faces+1,) 每个面的相邻边在indices中的起止位置
+        indices: (2M,) 相邻边编号
+    """
+    edge_faces = np.asarray(edgeFace_IncM, dtype=np.int64).reshape(-1)
+    edge_idxs = np.repeat(np.arange(edge_faces.shape[0] // 2, dtype=np.int64), 2)
 
-    min_z = np.min(point_cloud[:, 2])
-    max_z = np.max(point_cloud[:, 2])
+    # 稳定排序保证同一面内的边保持升序，与np.where的结果一致
+    order = np.argsort(edge_faces, kind='stable')
+    indices = edge_idxs[order]
 
-    # Create the 3D bounding box using the min and max values
-    min_point = np.array([min_x, min_y, min_z])
-    max_point = np.array([max_x, max_y, max_z])
-    return min_point, max_point
+    counts = np.bincount(edge_faces, minlength=num_faces)
+    indptr = np.zeros(num_faces + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
 
 def update_mapping(data_dict):
     """
@@ -35,11 +101,9 @@ def update_mapping(data_dict):
     if len(data_dict) == 0:
         return dict_new, mapping
 
-    max_idx = max(data_dict.keys())
-    skipped_indices = np.array(sorted(list(set(np.arange(max_idx)) - set(data_dict.keys()))))
-    for idx, value in data_dict.items():
-        skips = (skipped_indices < idx).sum()
-        idx_new = idx - skips
+    keys = np.fromiter(data_dict.keys(), dtype=np.int64, count=len(data_dict))
+    new_keys = np.searchsorted(np.sort(keys), keys)
+    for idx, idx_new, value in zip(data_dict.keys(), new_keys.tolist(), data_dict.values()):
         dict_new[idx_new] = value
         mapping[idx] = idx_new
     return dict_new, mapping
@@ -48,6 +112,8 @@ def update_mapping(data_dict):
 def face_edge_adj(shape: Union[Shell, Solid, Compound]):
     """
     从给定的shape中提取面/边几何信息并创建面-边邻接图
+    只遍历一次各面的边，同时得到边-面邻接和左右面，无需逐边查找相邻面
+    面、边编号与occwl.EntityMapper一致
 
     Args:
         shape: Shell, Solid, 或 Compound对象
@@ -58,47 +124,95 @@ def face_edge_adj(shape: Union[Shell, Solid, Compound]):
         edgeFace_IncM: 边-面关联矩阵，边ID作为键，相邻面ID作为值
     """
     assert isinstance(shape, (Shell, Solid, Compound))
-    mapper = EntityMapper(shape)
+    topods_shape = shape.topods_shape()
+
+    # 按首次出现的顺序编号，与shape.faces()/shape.edges()的顺序相同
+    face_map = TopTools_IndexedMapOfShape()
+    edge_map = TopTools_IndexedMapOfShape()
+    topexp_MapShapes(topods_shape, TopAbs_FACE, face_map)
+    topexp_MapShapes(topods_shape, TopAbs_EDGE, edge_map)
 
-    ### 提取面 ###
+    ### 提取面，并记录每条边在各面中出现的面编号和方向 ###
     face_dict = {}
-    for face in shape.faces():
-        face_idx = mapper.face_index(face)
+    edge_use_dict = {}
+    for face_idx in range(face_map.Size()):
+        face = Face(topods_Face(face_map.FindKey(face_idx + 1)))
         face_dict[face_idx] = (face.surface_type(), face)
 
+        exp_edge = TopExp_Explorer(face.topods_shape(), TopAbs_EDGE)
+        while exp_edge.More():
+            edge_shape = exp_edge.Current()
+            edge_idx = edge_map.FindIndex(edge_shape) - 1
+            edge_use_dict.setdefault(edge_idx, []).append((face_idx, edge_shape.Orientation()))
+            exp_edge.Next()
+
     ### 提取边和关联矩阵 ###
     edgeFace_IncM = {}
     edge_dict = {}
-    for edge in shape.edges():
+    for edge_idx, edge_use_list in edge_use_dict.items():
+        # 只保留恰好被两个不同面各使用一次的边
+        face_idx_list = [face_idx for face_idx, _ in edge_use_list]
+        if len(face_idx_list) != 2 or face_idx_list[0] == face_idx_list[1]:
+            continue
+
+        edge = Edge(topods_Edge(edge_map.FindKey(edge_idx + 1)))
         if not edge.has_curve():
             continue
 
-        connected_faces = list(shape.faces_from_edge(edge))
-        if len(connected_faces) == 2 and not edge.seam(connected_faces[0]) and not edge.seam(connected_faces[1]):
-            left_face, right_face = edge.find_left_and_right_faces(connected_faces)
-            if left_face is None or right_face is None:
-                continue
-            edge_idx = mapper.edge_index(edge) 
-            edge_dict[edge_idx] = edge 
-            left_index = mapper.face_index(left_face)
-            right_index = mapper.face_index(right_face)
-
-            if edge_idx in edgeFace_IncM:
-                edgeFace_IncM[edge_idx] += [left_index, right_index]
-            else:
-                edgeFace_IncM[edge_idx] = [left_index, right_index]
-        else:
-            pass  # 忽略seam边
+        # seam边与原实现一样由BRep_Tool.IsClosed判断，
+        # 共用同一周期曲面的两个分割面之间的边也可能在曲面上闭合，不能只看边在同一面中是否出现两次
+        if edge.seam(face_dict[face_idx_list[0]][1]) or edge.seam(face_dict[face_idx_list[1]][1]):
+            continue
+
+        # 与边首次出现时方向相同的面为左面，取第一个匹配的面，方向异常的壳也有确定的结果
+        orientation = edge.topods_shape().Orientation()
+        left_index = None
+        for i, (face_idx, edge_orientation) in enumerate(edge_use_list):
+            if edge_orientation == orientation:
+                left_index = i
+                break
+        if left_index is None:
+            continue
+
+        edge_dict[edge_idx] = edge
+        edgeFace_IncM[edge_idx] = [face_idx_list[left_index], face_idx_list[1 - left_index]]
 
     return face_dict, edge_dict, edgeFace_IncM
 
-def extract_geometry_data(shape: Union[Shell, Solid, Compound], split_closed: bool=True) -> dict:
+def split_closed_shape(shape: Union[Shell, Solid, Compound]) -> Union[Shell, Solid, Compound]:
+    """
+    分割shape中的闭合曲面和闭合曲线
+    """
+    if isinstance(shape, Solid):
+        shape = shape.split_all_closed_faces(num_splits=0)
+        shape = shape.split_all_closed_edges(num_splits=0)
+    # Shell和Compound也支持类似操作
+    elif hasattr(shape, 'split_all_closed_faces'):
+        shape = shape.split_all_closed_faces(num_splits=0)
+        shape = shape.split_all_closed_edges(num_splits=0)
+    return shape
+
+@record_function('extract_geometry_data')
+def extract_geometry_data(
+    shape: Union[Shell, Solid, Compound],
+    split_closed: bool=True,
+    face_edge_list: bool=True,
+    face_num_u: int=32,
+    face_num_v: int=32,
+    edge_num_u: int=32,
+    adaptive_sampling: bool=False,
+) -> dict:
     """
     从shape中提取所有几何数据
 
     Args:
         shape: Shell, Solid, 或 Compound对象
         split_closed: 是否分割闭合面和闭合边
+        face_edge_list: 是否额外输出list形式的面-边邻接关系（兼容旧格式）
+        face_num_u: 面u方向采样数
+        face_num_v: 面v方向采样数
+        edge_num_u: 边采样数
+        adaptive_sampling: 是否根据面的几何类型降低平面、直纹面的采样数，不影响边采样
 
     Returns:
         data: 包含所有导出数据的字典
@@ -107,91 +221,51 @@ def extract_geometry_data(shape: Union[Shell, Solid, Compound], split_closed: bo
 
     # 分割闭合曲面和闭合曲线
     if split_closed:
-        if isinstance(shape, Solid):
-            shape = shape.split_all_closed_faces(num_splits=0)
-            shape = shape.split_all_closed_edges(num_splits=0)
-        # Shell和Compound也支持类似操作
-        elif hasattr(shape, 'split_all_closed_faces'):
-            shape = shape.split_all_closed_faces(num_splits=0)
-            shape = shape.split_all_closed_edges(num_splits=0)
+        with record_stage('closed_face_split'):
+            shape = split_closed_shape(shape)
 
     # 提取面、边几何和面-边邻接关系
-    face_dict, edge_dict, edgeFace_IncM = face_edge_adj(shape)
-
-    # 跳过未使用的索引键，并更新邻接关系
-    face_dict, face_map = update_mapping(face_dict)
-    edge_dict, edge_map = update_mapping(edge_dict)
-    edgeFace_IncM_update = {}
-    for key, value in edgeFace_IncM.items():
-        new_face_indices = [face_map[x] for x in value]
-        edgeFace_IncM_update[edge_map[key]] = new_face_indices
-    edgeFace_IncM = edgeFace_IncM_update
-
-    # 构建面-边邻接关系
-    num_faces = len(face_dict)
-    if len(edgeFace_IncM) > 0:
-        edgeFace_IncM_array = np.stack([x for x in edgeFace_IncM.values()])
-    else:
-        edgeFace_IncM_array = np.array([]).reshape(0, 2)
-
-    faceEdge_IncM = []
-    for surf_idx in range(num_faces):
+    with record_stage('face_edge_adj'):
+        face_dict, edge_dict, edgeFace_IncM = face_edge_adj(shape)
+
+    with record_stage('index_compaction'):
+        # 跳过未使用的索引键，并更新邻接关系
+        face_lut = build_index_lut(face_dict.keys())
+        face_dict, _ = update_mapping(face_dict)
+        edge_dict, _ = update_mapping(edge_dict)
+
+        # 构建面-边邻接关系
+        num_faces = len(face_dict)
+        if len(edgeFace_IncM) > 0:
+            edgeFace_IncM_array = face_lut[np.array(list(edgeFace_IncM.values()), dtype=np.int64)]
+        else:
+            edgeFace_IncM_array = np.array([]).reshape(0, 2)
+
+        faceEdge_indptr, faceEdge_indices = build_face_edge_csr(edgeFace_IncM_array, num_faces)
+
+    faceEdge_IncM = None
+    if face_edge_list:
         if len(edgeFace_IncM_array) > 0:
-            surf_edges, _ = np.where(edgeFace_IncM_array == surf_idx)
-            faceEdge_IncM.append(surf_edges)
+            faceEdge_IncM = np.split(faceEdge_indices, faceEdge_indptr[1:-1])
         else:
-            faceEdge_IncM.append(np.array([]))
-
-    # 从曲面采样uv网格 (32x32)
-    graph_face_feat = {}
-    for face_idx, face_feature in face_dict.items():
-        _, face = face_feature
-        try:
-            points = uvgrid(face, method="point", num_u=32, num_v=32)
-            visibility_status = uvgrid(face, method="visibility_status", num_u=32, num_v=32)
-            mask = np.logical_or(visibility_status == 0, visibility_status == 2)  # 0: Inside, 1: Outside, 2: On boundary
-            # 沿通道方向拼接形成面特征张量
-            face_feat = np.concatenate((points, mask), axis=-1)
-            graph_face_feat[face_idx] = face_feat
-        except Exception as e:
-            print(f"Warning: Failed to sample face {face_idx}: {e}")
-            # 使用零填充
-            graph_face_feat[face_idx] = np.zeros((32, 32, 4))
-
-    if len(graph_face_feat) > 0:
-        face_pnts = np.stack([x for x in graph_face_feat.values()])
-    else:
-        face_pnts = np.array([]).reshape(0, 32, 32, 4)
-
-    # 从曲线采样u网格 (1x32)
-    graph_edge_feat = {}
-    graph_corner_feat = {}
-    for edge_idx, edge in edge_dict.items():
-        try:
-            points = ugrid(edge, method="point", num_u=32)
-            graph_edge_feat[edge_idx] = points
-            # 边的起始/终止顶点
-            v_start = points[0]
-            v_end = points[-1]
-            graph_corner_feat[edge_idx] = (v_start, v_end)
-        except Exception as e:
-            print(f"Warning: Failed to sample edge {edge_idx}: {e}")
-            # 使用零填充
-            graph_edge_feat[edge_idx] = np.zeros((32, 3))
-            graph_corner_feat[edge_idx] = (np.zeros(3), np.zeros(3))
-
-    if len(graph_edge_feat) > 0:
-        edge_pnts = np.stack([x for x in graph_edge_feat.values()])
-        edge_corner_pnts = np.stack([x for x in graph_corner_feat.values()])
-    else:
-        edge_pnts = np.array([]).reshape(0, 32, 3)
-        edge_corner_pnts = np.array([]).reshape(0, 2, 3)
+            faceEdge_IncM = [np.array([]) for _ in range(num_faces)]
+
+    # 从曲面采样uv网格 (num_u x num_v)
+    with record_stage('face_sampling'):
+        face_pnts = sample_faces(face_dict, face_num_u, face_num_v, adaptive_sampling)
+
+    # 从曲线采样u网格 (1 x num_u)
+    with record_stage('edge_sampling'):
+        edge_pnts, edge_corner_pnts = sample_edges(edge_dict, edge_num_u)
 
     data = {
         'face_pnts': face_pnts,
         'edge_pnts': edge_pnts,
         'edge_corner_pnts': edge_corner_pnts,
         'edgeFace_IncM': edgeFace_IncM_array,
-        'faceEdge_IncM': faceEdge_IncM,
+        'faceEdge_indptr': faceEdge_indptr,
+        'faceEdge_indices': faceEdge_indices,
     }
+    if faceEdge_IncM is not None:
+        data['faceEdge_IncM'] = faceEdge_IncM
     return data
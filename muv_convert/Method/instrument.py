@@ -0,0 +1,184 @@
+import cProfile
+import functools
+import tracemalloc
+import numpy as np
+from time import perf_counter
+from contextlib import contextmanager
+
+from muv_convert.Method.batch import get_peak_rss
+
+
+# 当前进程正在记录的结果，None表示未开启记录
+_record = None
+_trace_memory = False
+# 阶段进入/退出时调用的钩子，签名为hook(stage_name, event)，event为'enter'或'exit'
+_stage_hook_list = []
+
+
+def start_record(trace_memory: bool = False) -> dict:
+    """
+    开始记录当前进程中各阶段的耗时和计数
+
+    Args:
+        trace_memory: 是否使用tracemalloc统计Python层的峰值内存，会降低运行速度
+    """
+    global _record, _trace_memory
+    _record = {
+        'stages': {},
+        'stage_calls': {},
+        'counts': {},
+    }
+
+    _trace_memory = trace_memory
+    if trace_memory:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+    return _record
+
+
+def stop_record() -> dict:
+    """
+    结束记录
+
+    Returns:
+        record: {'stages': 阶段累计耗时（秒）, 'stage_calls': 阶段调用次数, 'counts': 计数,
+                 'peak_rss': 进程峰值内存（字节）, 'peak_traced': tracemalloc峰值（字节），未开启时为None}
+    """
+    global _record, _trace_memory
+    record = _record
+    _record = None
+    if record is None:
+        return None
+
+    record['peak_rss'] = get_peak_rss()
+    record['peak_traced'] = None
+    if _trace_memory:
+        record['peak_traced'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        _trace_memory = False
+    return record
+
+
+def is_recording() -> bool:
+    return _record is not None
+
+
+@contextmanager
+def record_stage(stage_name: str):
+    """
+    记录一个阶段的耗时，阶段可以嵌套，嵌套阶段的耗时会同时计入外层阶段
+    未开启记录且没有钩子时几乎没有开销
+    """
+    if _record is None and len(_stage_hook_list) == 0:
+        yield
+        return
+
+    for hook in _stage_hook_list:
+        hook(stage_name, 'enter')
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        spend = perf_counter() - start
+        if _record is not None:
+            _record['stages'][stage_name] = _record['stages'].get(stage_name, 0.0) + spend
+            _record['stage_calls'][stage_name] = _record['stage_calls'].get(stage_name, 0) + 1
+
+        for hook in _stage_hook_list:
+            hook(stage_name, 'exit')
+
+
+def record_function(stage_name: str):
+    """
+    装饰器，将整个函数作为一个阶段记录
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with record_stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def add_count(key: str, value: int = 1) -> bool:
+    if _record is None:
+        return False
+
+    _record['counts'][key] = _record['counts'].get(key, 0) + value
+    return True
+
+
+def add_stage_hook(hook) -> bool:
+    if hook not in _stage_hook_list:
+        _stage_hook_list.append(hook)
+    return True
+
+
+def remove_stage_hook(hook) -> bool:
+    if hook in _stage_hook_list:
+        _stage_hook_list.remove(hook)
+    return True
+
+
+def create_cprofile_hook(profile_stage_name: str = 'parse_shape'):
+    """
+    创建只在指定阶段内开启cProfile的钩子，
+    也可以参考该钩子的写法，在阶段进入/退出时写入py-spy等外部工具可识别的标记
+
+    Returns:
+        (hook, profiler): 通过add_stage_hook注册hook，结束后使用profiler.dump_stats保存结果
+    """
+    profiler = cProfile.Profile()
+
+    def hook(stage_name: str, event: str) -> None:
+        if stage_name != profile_stage_name:
+            return
+
+        if event == 'enter':
+            profiler.enable()
+        else:
+            profiler.disable()
+        return
+
+    return hook, profiler
+
+
+def aggregate_records(record_list: list, percentile_list: list = [50, 90, 99]) -> dict:
+    """
+    汇总多个文件的记录，计算每个阶段耗时和每个计数的分位数
+
+    Returns:
+        summary: {'stages': {stage_name: {'mean', 'p50', ...}}, 'counts': {key: {...}}, 'peak_rss': {...}}
+    """
+    def summarize(value_list: list) -> dict:
+        values = np.asarray(value_list, dtype=np.float64)
+        summary = {'mean': float(values.mean()), 'max': float(values.max())}
+        for percentile in percentile_list:
+            summary['p' + str(percentile)] = float(np.percentile(values, percentile))
+        return summary
+
+    record_list = [record for record in record_list if record is not None]
+    if len(record_list) == 0:
+        return {}
+
+    stage_name_list = sorted(set(name for record in record_list for name in record['stages']))
+    count_key_list = sorted(set(key for record in record_list for key in record['counts']))
+
+    summary = {
+        'record_num': len(record_list),
+        'stages': {},
+        'counts': {},
+    }
+    for stage_name in stage_name_list:
+        summary['stages'][stage_name] = summarize(
+            [record['stages'].get(stage_name, 0.0) for record in record_list])
+    for count_key in count_key_list:
+        summary['counts'][count_key] = summarize(
+            [record['counts'].get(count_key, 0) for record in record_list])
+
+    peak_rss_list = [record['peak_rss'] for record in record_list if record.get('peak_rss', -1) >= 0]
+    if len(peak_rss_list) > 0:
+        summary['peak_rss'] = summarize(peak_rss_list)
+    return summary
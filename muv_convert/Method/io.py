@@ -6,15 +6,23 @@ from occwl.compound import Compound
 from OCC.Core.TopExp import TopExp_Explorer
 from OCC.Core.IFSelect import IFSelect_RetDone
 from OCC.Core.STEPControl import STEPControl_Reader
-from OCC.Core.TopAbs import TopAbs_SOLID, TopAbs_SHELL
+from OCC.Core.TopExp import topexp_MapShapes
+from OCC.Core.TopAbs import TopAbs_SOLID, TopAbs_SHELL, TopAbs_FACE, TopAbs_EDGE
 from OCC.Core.TopoDS import topods_Solid, topods_Shell
+from OCC.Core.TopTools import TopTools_IndexedMapOfShape
 
+from muv_convert.Method.brep import brep_string_to_shape
+from muv_convert.Method.schema import compact_shape_data
+from muv_convert.Method.normalize import normalize_shape_data
+from muv_convert.Method.instrument import record_function, record_stage, add_count
 from muv_convert.Method.convert_utils import (
     get_bbox,
+    merge_corners,
     extract_geometry_data,
 )
 
 
+@record_function('load_step_file')
 def load_step_file(step_file_path: str):
     """
     使用pythonocc-core读取STEP文件，返回所有形状
@@ -38,12 +46,107 @@ def load_step_file(step_file_path: str):
 
     return shape
 
-def extract_all_shapes(shape):
+def count_faces_edges(shape) -> tuple:
+    """
+    统计shape中不重复的面数和边数，只遍历拓扑，不做任何几何计算
+
+    Args:
+        shape: OCC TopoDS_Shape对象
+
+    Returns:
+        (face_num, edge_num)
+    """
+    face_map = TopTools_IndexedMapOfShape()
+    topexp_MapShapes(shape, TopAbs_FACE, face_map)
+
+    edge_map = TopTools_IndexedMapOfShape()
+    topexp_MapShapes(shape, TopAbs_EDGE, edge_map)
+    return face_map.Extent(), edge_map.Extent()
+
+def check_shape_size(
+    shape,
+    max_face_num: Union[int, None] = None,
+    max_edge_num: Union[int, None] = None,
+) -> Union[str, None]:
+    """
+    在分割闭合面和采样前检查形状规模
+    注意这里统计的是分割闭合面之前的面数
+
+    Returns:
+        skip_reason: 需要跳过的原因，保留时返回None
+    """
+    face_num, edge_num = count_faces_edges(shape)
+    return get_skip_reason(face_num, edge_num, max_face_num, max_edge_num)
+
+def get_skip_reason(
+    face_num: int,
+    edge_num: int,
+    max_face_num: Union[int, None] = None,
+    max_edge_num: Union[int, None] = None,
+) -> Union[str, None]:
+    if face_num == 0:
+        return 'no face'
+    if max_face_num is not None and face_num > max_face_num:
+        return 'face num %d > %d' % (face_num, max_face_num)
+    if max_edge_num is not None and edge_num > max_edge_num:
+        return 'edge num %d > %d' % (edge_num, max_edge_num)
+    return None
+
+def filter_shapes(
+    shapes_list: list,
+    max_face_num: Union[int, None] = None,
+    max_edge_num: Union[int, None] = None,
+    skip_info_list: Union[list, None] = None,
+    size_list: Union[list, None] = None,
+) -> list:
+    """
+    剔除过大或退化的形状
+
+    Args:
+        shapes_list: extract_all_shapes得到的(shape_type, shape_obj)列表
+        max_face_num: 最大面数，None表示不限制，参考Config.constant.MAX_FACE
+        max_edge_num: 最大边数，None表示不限制
+        skip_info_list: 不为None时追加被跳过形状的信息
+        size_list: 预先统计的(face_num, edge_num)列表，为None时由count_faces_edges统计
+
+    Returns:
+        shapes_list: 保留的形状列表
+    """
+    valid_shapes_list = []
+    for shape_idx, (shape_type, shape_obj) in enumerate(shapes_list):
+        if size_list is None:
+            skip_reason = check_shape_size(shape_obj.topods_shape(), max_face_num, max_edge_num)
+        else:
+            face_num, edge_num = size_list[shape_idx]
+            skip_reason = get_skip_reason(face_num, edge_num, max_face_num, max_edge_num)
+        if skip_reason is None:
+            valid_shapes_list.append((shape_type, shape_obj))
+            continue
+
+        if skip_info_list is not None:
+            skip_info_list.append({
+                'shape_idx': shape_idx,
+                'type': shape_type,
+                'reason': skip_reason,
+            })
+    return valid_shapes_list
+
+@record_function('extract_all_shapes')
+def extract_all_shapes(
+    shape,
+    max_face_num: Union[int, None] = None,
+    max_edge_num: Union[int, None] = None,
+    skip_info_list: Union[list, None] = None,
+):
     """
     从顶层shape中提取所有可处理的形状（Solid, Shell, Compound）
+    并在采样前剔除面数、边数超出限制或没有面的形状
 
     Args:
         shape: OCC TopoDS_Shape对象
+        max_face_num: 最大面数，None表示不限制
+        max_edge_num: 最大边数，None表示不限制
+        skip_info_list: 不为None时追加被跳过形状的信息
 
     Returns:
         shapes_list: 包含所有可处理形状的列表
@@ -81,72 +184,124 @@ def extract_all_shapes(shape):
         except Exception as e:
             print(f"Warning: Failed to convert Compound: {e}")
 
-    return shapes_list
+    return filter_shapes(shapes_list, max_face_num, max_edge_num, skip_info_list)
 
 
-def parse_shape(shape_obj: Union[Shell, Solid, Compound], split_closed: bool = True) -> dict:
+def create_occwl_shape(shape_type: str, shape) -> Union[Shell, Solid, Compound]:
     """
-    从shape中提取原始几何数据，不进行归一化处理
+    由extract_all_shapes中的形状类型和TopoDS_Shape重建occwl对象
+    """
+    if shape_type == 'Solid':
+        return Solid(topods_Solid(shape))
+    if shape_type == 'Shell':
+        return Shell(topods_Shell(shape))
+    return Compound(shape)
+
+
+@record_function('parse_shape')
+def parse_shape(
+    shape_obj: Union[Shell, Solid, Compound],
+    split_closed: bool = True,
+    face_edge_list: bool = True,
+    face_num_u: int = 32,
+    face_num_v: int = 32,
+    edge_num_u: int = 32,
+    adaptive_sampling: bool = False,
+    normalize: bool = False,
+    compact: bool = False,
+    coord_dtype: str = 'float32',
+) -> dict:
+    """
+    从shape中提取原始几何数据，normalize为False时不进行归一化处理
 
     Args:
         shape_obj: Shell, Solid, 或 Compound对象
         split_closed: 是否分割闭合面和闭合边
+        face_edge_list: 是否输出list形式的faceEdge_adj（兼容旧格式）
+        face_num_u: 面u方向采样数
+        face_num_v: 面v方向采样数
+        edge_num_u: 边采样数
+        adaptive_sampling: 是否对平面、直纹面降低采样数后重采样到输出网格，输出形状不变，只影响面采样
+        normalize: 是否额外输出形状、面、边的包围盒及面、边的归一化局部坐标，见Method.normalize.normalize_shape_data
+        compact: 是否输出紧凑格式，见Method.schema.compact_shape_data，此时忽略face_edge_list
+        coord_dtype: 紧凑格式的坐标存储类型，'float32', 'float16' 或 'uint16'
 
     Returns:
         data: A dictionary containing all parsed data
-            - face_pnts: (N, 32, 32, 4) 面采样点和mask，前3维是xyz坐标，第4维是mask
-            - edge_pnts: (M, 32, 3) 边采样点
+            - face_pnts: (N, face_num_u, face_num_v, 4) 面采样点和mask，前3维是xyz坐标，第4维是mask
+            - edge_pnts: (M, edge_num_u, 3) 边采样点
             - edge_corner_pnts: (M, 2, 3) 边的起始和终止顶点
             - edgeFace_IncM: (M, 2) 边-面邻接矩阵
-            - faceEdge_IncM: list of arrays，面-边邻接关系
+            - faceEdge_indptr: (N+1,) CSR格式面-边邻接关系的行指针
+            - faceEdge_indices: (2M,) CSR格式面-边邻接关系的边编号
+            - faceEdge_adj: list of arrays，面-边邻接关系，仅face_edge_list为True时输出
             - corner_unique: 去重后的顶点
             - edgeCorner_IncM: 边-顶点邻接关系
     """
 
-    data = extract_geometry_data(shape_obj, split_closed)
+    data = extract_geometry_data(
+        shape_obj,
+        split_closed,
+        face_edge_list,
+        face_num_u,
+        face_num_v,
+        edge_num_u,
+        adaptive_sampling,
+    )
 
-    face_pnts = data['face_pnts']  # (N, 32, 32, 4) - 包含xyz和mask
-    edge_pnts = data['edge_pnts']  # (M, 32, 3)
+    face_pnts = data['face_pnts']  # (N, face_num_u, face_num_v, 4) - 包含xyz和mask
+    edge_pnts = data['edge_pnts']  # (M, edge_num_u, 3)
     edge_corner_pnts = data['edge_corner_pnts']  # (M, 2, 3)
     edgeFace_IncM = data['edgeFace_IncM']
-    faceEdge_IncM = data['faceEdge_IncM']
-
-    # Remove duplicate and merge corners
-    corner_pnts = np.round(edge_corner_pnts, 4)
-    corner_unique = []
-    for corner_pnt in corner_pnts.reshape(-1, 3):
-        if len(corner_unique) == 0:
-            corner_unique = corner_pnt.reshape(1, 3)
-        else:
-            # Check if it exists or not
-            exists = np.any(np.all(corner_unique == corner_pnt, axis=1))
-            if not exists:
-                corner_unique = np.concatenate([corner_unique, corner_pnt.reshape(1, 3)], 0)
-    corner_unique = np.asarray(corner_unique) if len(corner_unique) > 0 else np.array([]).reshape(0, 3)
-
-    # Edge-corner adjacency
-    edgeCorner_IncM = []
-    if corner_unique.size > 0 and corner_pnts.size > 0:
-        for edge_corner in corner_pnts:
-            start_corner_idx = np.where((corner_unique == edge_corner[0]).all(axis=1))[0].item()
-            end_corner_idx = np.where((corner_unique == edge_corner[1]).all(axis=1))[0].item()
-            edgeCorner_IncM.append([start_corner_idx, end_corner_idx])
-    edgeCorner_IncM = np.array(edgeCorner_IncM) if len(edgeCorner_IncM) > 0 else np.array([]).reshape(0, 2)
+
+    # Remove duplicate and merge corners, build edge-corner adjacency
+    with record_stage('corner_dedup'):
+        corner_unique, edgeCorner_IncM = merge_corners(edge_corner_pnts, decimals=4)
+
+    add_count('face_num', face_pnts.shape[0])
+    add_count('edge_num', edge_pnts.shape[0])
 
     # Convert to float32 to save space
     result_data = {
         # 原始几何数据（不归一化）
-        'face_pnts': face_pnts.astype(np.float32),  # (N, 32, 32, 4) 包含xyz和mask
-        'edge_pnts': edge_pnts.astype(np.float32),  # (M, 32, 3)
+        'face_pnts': face_pnts.astype(np.float32),  # (N, face_num_u, face_num_v, 4) 包含xyz和mask
+        'edge_pnts': edge_pnts.astype(np.float32),  # (M, edge_num_u, 3)
         'edge_corner_pnts': edge_corner_pnts.astype(np.float32),  # (M, 2, 3)
 
         # 邻接关系
         'edgeFace_adj': edgeFace_IncM,
         'edgeCorner_adj': edgeCorner_IncM,
-        'faceEdge_adj': faceEdge_IncM,
+        'faceEdge_indptr': data['faceEdge_indptr'],
+        'faceEdge_indices': data['faceEdge_indices'],
 
         # 顶点
         'corner_unique': corner_unique.astype(np.float32),
     }
 
+    if normalize:
+        with record_stage('normalization'):
+            result_data = normalize_shape_data(result_data)
+
+    if compact:
+        return compact_shape_data(result_data, coord_dtype)
+
+    if face_edge_list:
+        result_data['faceEdge_adj'] = data['faceEdge_IncM']
+
     return result_data
+
+
+def parse_brep_shape(shape_type: str, brep_str: str, parse_params: dict) -> dict:
+    """
+    由BREP文本恢复形状并解析，用于在子进程中并行解析多个形状
+
+    Args:
+        shape_type: 'Solid', 'Shell' 或 'Compound'
+        brep_str: shape_to_brep_string得到的BREP文本
+        parse_params: parse_shape的参数
+
+    Returns:
+        data: parse_shape的结果
+    """
+    shape_obj = create_occwl_shape(shape_type, brep_string_to_shape(brep_str))
+    return parse_shape(shape_obj, **parse_params)
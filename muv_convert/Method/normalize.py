@@ -0,0 +1,108 @@
+import numpy as np
+
+
+def get_bbox(point_cloud):
+    """
+    Get the tighest fitting 3D bounding box giving a set of points (axis-aligned)
+    """
+    point_cloud = np.asarray(point_cloud).reshape(-1, 3)
+    return point_cloud.min(axis=0), point_cloud.max(axis=0)
+
+
+def get_batch_bbox(pnts, mask=None) -> np.ndarray:
+    """
+    一次性计算多组点的包围盒，不逐组循环
+
+    Args:
+        pnts: (K, ..., 3) K组点
+        mask: (K, ...) 有效点的mask，None表示全部有效，某组没有有效点时使用该组全部点
+
+    Returns:
+        bboxes: (K, 2, 3) 每组点的最小值和最大值
+    """
+    pnts = np.asarray(pnts)
+    group_num = pnts.shape[0]
+    if group_num == 0:
+        return np.zeros((0, 2, 3), dtype=pnts.dtype)
+
+    pnts = pnts.reshape(group_num, -1, 3)
+    if mask is None:
+        return np.stack([pnts.min(axis=1), pnts.max(axis=1)], axis=1)
+
+    mask = np.asarray(mask).reshape(group_num, -1) > 0.5
+    # 没有有效点的组退化为使用全部点，避免得到inf
+    mask[~mask.any(axis=1)] = True
+
+    valid = mask[..., None]
+    min_pnts = np.where(valid, pnts, np.inf).min(axis=1)
+    max_pnts = np.where(valid, pnts, -np.inf).max(axis=1)
+    return np.stack([min_pnts, max_pnts], axis=1).astype(pnts.dtype)
+
+
+def normalize_by_bbox(pnts, bboxes) -> np.ndarray:
+    """
+    将每组点平移缩放到[-1, 1]^3，三个方向等比例缩放
+
+    Args:
+        pnts: (K, ..., 3)
+        bboxes: (K, 2, 3)
+
+    Returns:
+        ncs_pnts: (K, ..., 3) 归一化后的局部坐标
+    """
+    pnts = np.asarray(pnts)
+    if pnts.shape[0] == 0:
+        return pnts.copy()
+
+    center = (bboxes[:, 0] + bboxes[:, 1]) / 2.0
+    scale = (bboxes[:, 1] - bboxes[:, 0]).max(axis=1) / 2.0
+    scale[scale == 0] = 1.0
+
+    expand_shape = (pnts.shape[0],) + (1,) * (pnts.ndim - 2)
+    return (pnts - center.reshape(expand_shape + (3,))) / scale.reshape(expand_shape + (1,))
+
+
+def normalize_shape_data(data: dict) -> dict:
+    """
+    计算形状、每个面、每条边的包围盒，并将面、边采样点归一化到各自包围盒的局部坐标
+    面包围盒只统计mask为1的采样点，全部计算均为批量numpy运算
+
+    Args:
+        data: parse_shape输出的数据，face_pnts为(N, num_u, num_v, 3或4)
+
+    Returns:
+        data: 增加以下字段后的数据
+            - shape_bbox: (2, 3) 形状包围盒，由有效面采样点和边采样点计算
+            - face_bbox: (N, 2, 3) 面包围盒
+            - edge_bbox: (M, 2, 3) 边包围盒
+            - face_ncs: (N, num_u, num_v, 3) 面采样点在面包围盒中的归一化坐标，mask为0的采样点置为0
+            - edge_ncs: (M, edge_num_u, 3) 边采样点在边包围盒中的归一化坐标
+    """
+    face_pnts = data['face_pnts']
+    edge_pnts = data['edge_pnts']
+
+    face_xyz = face_pnts[..., :3]
+    face_mask = face_pnts[..., 3] if face_pnts.shape[-1] == 4 else None
+
+    face_bbox = get_batch_bbox(face_xyz, face_mask)
+    edge_bbox = get_batch_bbox(edge_pnts)
+
+    bbox_list = [bbox for bbox in [face_bbox, edge_bbox] if bbox.shape[0] > 0]
+    if len(bbox_list) > 0:
+        shape_bbox = np.stack(get_bbox(np.concatenate(bbox_list, axis=0)))
+    else:
+        shape_bbox = np.zeros((2, 3))
+
+    data['shape_bbox'] = shape_bbox.astype(np.float32)
+    data['face_bbox'] = face_bbox.astype(np.float32)
+    data['edge_bbox'] = edge_bbox.astype(np.float32)
+
+    # mask为0的采样点不参与面包围盒计算，归一化后可能超出[-1, 1]，量化为uint16时会被截断，
+    # 置为0使浮点与量化格式的结果一致
+    face_ncs = normalize_by_bbox(face_xyz, face_bbox)
+    if face_mask is not None:
+        face_ncs = np.where(face_mask[..., None] > 0.5, face_ncs, 0.0)
+
+    data['face_ncs'] = face_ncs.astype(np.float32)
+    data['edge_ncs'] = normalize_by_bbox(edge_pnts, edge_bbox).astype(np.float32)
+    return data
@@ -1,4 +1,5 @@
 import os
+from glob import glob, escape
 from time import time
 from shutil import rmtree
 
@@ -88,3 +89,16 @@ def waitFile(file_path: str, wait_second: int) -> bool:
             break
 
     return os.path.exists(file_path)
+
+
+def getTmpFilePath(file_path: str) -> str:
+    return file_path + "." + str(os.getpid()) + ".tmp"
+
+
+def removeTmpFiles(file_path: str) -> bool:
+    """
+    删除getTmpFilePath为file_path生成的所有临时文件，用于清理被终止的子进程留下的文件
+    """
+    for tmp_file_path in glob(escape(file_path) + ".*.tmp"):
+        removeFile(tmp_file_path)
+    return True
@@ -0,0 +1,42 @@
+import os
+import pickle
+
+
+def iter_pkl_file(pkl_file_path: str):
+    """
+    逐个返回pkl文件中的形状数据
+    同时支持两种格式:
+        - pickle.dump(shape_data_list) 写入的单个list
+        - 流式写入的多个连续pickle帧，每帧为一个形状数据
+
+    Yields:
+        shape_data: 包含'type'和'data'的字典
+    """
+    with open(pkl_file_path, 'rb') as f:
+        while True:
+            try:
+                obj = pickle.load(f)
+            except EOFError:
+                break
+
+            if isinstance(obj, list):
+                for shape_data in obj:
+                    yield shape_data
+            else:
+                yield obj
+
+
+def load_pkl_file(pkl_file_path: str):
+    """
+    读取pkl文件中的所有形状数据
+
+    Returns:
+        shape_data_list: 形状数据列表，文件不存在时返回None
+    """
+    if not os.path.exists(pkl_file_path):
+        print('[ERROR][pkl::load_pkl_file]')
+        print('\t pkl file not exist!')
+        print('\t pkl_file_path:', pkl_file_path)
+        return None
+
+    return list(iter_pkl_file(pkl_file_path))
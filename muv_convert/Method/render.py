@@ -1,94 +1,40 @@
 import numpy as np
 import open3d as o3d
 
+from muv_convert.Method.render_utils import merge_geometry, merge_geometry_list
 
-def random_color():
-    return np.random.rand(3)
 
-
-def vis_faces_edges(
-    face_pnts,           # (N, 32, 32, 3) or (N, 32, 32, 4)
-    edge_pnts,           # (M, 32, 3)
-    edge_corner_pnts,    # (M, 2, 3)
-):
+def create_o3d_geometries(geometry: dict) -> list:
+    """
+    由merge_geometry的结果创建一个PointCloud和一个LineSet
+    """
     geoms = []
 
-    N = face_pnts.shape[0]
-    M = edge_pnts.shape[0]
-
-    # 检查是否包含mask维度
-    has_mask = face_pnts.shape[-1] == 4
-
-    # ---------------------
-    # 1) visualize faces
-    # ---------------------
-    for i in range(N):
-        if has_mask:
-            # 提取坐标和mask
-            coords = face_pnts[i, :, :, :3]  # (32, 32, 3)
-            mask = face_pnts[i, :, :, 3]     # (32, 32)
-
-            # 只选择mask为1的点
-            mask_flat = mask.reshape(-1)
-            coords_flat = coords.reshape(-1, 3)
-            valid_indices = mask_flat == 1
-            pts = coords_flat[valid_indices]
-
-            # 如果没有有效点，跳过这个face
-            if pts.shape[0] == 0:
-                continue
-        else:
-            # 没有mask，使用所有点
-            pts = face_pnts[i].reshape(-1, 3)
-
-        # create point cloud for the face
+    if geometry['points'].shape[0] > 0:
         pc = o3d.geometry.PointCloud()
-        pc.points = o3d.utility.Vector3dVector(pts)
-
-        color = random_color()
-        pc.colors = o3d.utility.Vector3dVector(
-            np.tile(color, (pts.shape[0], 1))
-        )
-
+        pc.points = o3d.utility.Vector3dVector(geometry['points'].astype(np.float64))
+        pc.colors = o3d.utility.Vector3dVector(geometry['point_colors'].astype(np.float64))
         geoms.append(pc)
 
-    # ---------------------
-    # 2) visualize edges
-    # ---------------------
-    for eid in range(M):
-        pts = edge_pnts[eid]  # (32, 3)
-
+    if geometry['lines'].shape[0] > 0:
         line_set = o3d.geometry.LineSet()
-        line_set.points = o3d.utility.Vector3dVector(pts)
-
-        # each consecutive pair makes a line segment
-        lines = [[i, i+1] for i in range(len(pts)-1)]
-        line_set.lines = o3d.utility.Vector2iVector(lines)
-
-        color = random_color()
-        line_set.colors = o3d.utility.Vector3dVector(
-            np.tile(color, (len(lines), 1))
-        )
-
+        line_set.points = o3d.utility.Vector3dVector(geometry['line_points'].astype(np.float64))
+        line_set.lines = o3d.utility.Vector2iVector(geometry['lines'].astype(np.int32))
+        line_set.colors = o3d.utility.Vector3dVector(geometry['line_colors'].astype(np.float64))
         geoms.append(line_set)
 
-    # ---------------------
-    # 3) visualize edge corners
-    # ---------------------
-    for eid in range(M):
-        corners = edge_corner_pnts[eid]  # (2, 3)
+    return geoms
 
-        pc = o3d.geometry.PointCloud()
-        pc.points = o3d.utility.Vector3dVector(corners)
-
-        color = np.array([1, 0, 0])  # red for corners
-        pc.colors = o3d.utility.Vector3dVector(
-            np.tile(color, (2, 1))
-        )
 
-        geoms.append(pc)
+def vis_faces_edges(
+    face_pnts,           # (N, 32, 32, 3) or (N, 32, 32, 4)
+    edge_pnts,           # (M, 32, 3)
+    edge_corner_pnts,    # (M, 2, 3)
+):
+    # 所有面点和顶点合并为一个点云，所有边合并为一个线集，避免为每个面、每条边创建单独的几何体
+    geometry = merge_geometry(face_pnts, edge_pnts, edge_corner_pnts)
 
-    o3d.visualization.draw_geometries(geoms)
+    o3d.visualization.draw_geometries(create_o3d_geometries(geometry))
     return True
 
 
@@ -107,7 +53,7 @@ def vis_faces_edges_list(shape_data_list):
         print('[WARN] shape_data_list is empty, nothing to visualize')
         return False
 
-    geoms = []
+    geometry_list = []
     total_faces = 0
     total_edges = 0
 
@@ -126,9 +72,6 @@ def vis_faces_edges_list(shape_data_list):
             print(f'[WARN] Shape {shape_idx} ({shape_type}) has no geometry data, skipping')
             continue
 
-        # 检查是否包含mask维度
-        has_mask = face_pnts.shape[-1] == 4 if face_pnts.size > 0 else False
-
         N = face_pnts.shape[0] if face_pnts.size > 0 else 0
         M = edge_pnts.shape[0] if edge_pnts.size > 0 else 0
 
@@ -136,80 +79,14 @@ def vis_faces_edges_list(shape_data_list):
         total_faces += N
         total_edges += M
 
-        # ---------------------
-        # 1) visualize faces
-        # ---------------------
-        for i in range(N):
-            if has_mask:
-                # 提取坐标和mask
-                coords = face_pnts[i, :, :, :3]  # (32, 32, 3)
-                mask = face_pnts[i, :, :, 3]     # (32, 32)
-
-                # 只选择mask为1的点
-                mask_flat = mask.reshape(-1)
-                coords_flat = coords.reshape(-1, 3)
-                valid_indices = mask_flat == 1
-                pts = coords_flat[valid_indices]
-
-                # 如果没有有效点，跳过这个face
-                if pts.shape[0] == 0:
-                    continue
-            else:
-                # 没有mask，使用所有点
-                pts = face_pnts[i].reshape(-1, 3)
-
-            # create point cloud for the face
-            pc = o3d.geometry.PointCloud()
-            pc.points = o3d.utility.Vector3dVector(pts)
-
-            color = random_color()
-            pc.colors = o3d.utility.Vector3dVector(
-                np.tile(color, (pts.shape[0], 1))
-            )
-
-            geoms.append(pc)
-
-        # ---------------------
-        # 2) visualize edges
-        # ---------------------
-        for eid in range(M):
-            pts = edge_pnts[eid]  # (32, 3)
-
-            line_set = o3d.geometry.LineSet()
-            line_set.points = o3d.utility.Vector3dVector(pts)
-
-            # each consecutive pair makes a line segment
-            lines = [[i, i+1] for i in range(len(pts)-1)]
-            line_set.lines = o3d.utility.Vector2iVector(lines)
-
-            color = random_color()
-            line_set.colors = o3d.utility.Vector3dVector(
-                np.tile(color, (len(lines), 1))
-            )
-
-            geoms.append(line_set)
-
-        # ---------------------
-        # 3) visualize edge corners
-        # ---------------------
-        if edge_corner_pnts.size > 0:
-            for eid in range(M):
-                corners = edge_corner_pnts[eid]  # (2, 3)
-
-                pc = o3d.geometry.PointCloud()
-                pc.points = o3d.utility.Vector3dVector(corners)
-
-                color = np.array([1, 0, 0])  # red for corners
-                pc.colors = o3d.utility.Vector3dVector(
-                    np.tile(color, (2, 1))
-                )
-
-                geoms.append(pc)
-
-    if len(geoms) == 0:
+        geometry_list.append(merge_geometry(face_pnts, edge_pnts, edge_corner_pnts))
+
+    if len(geometry_list) == 0:
         print('[WARN] No geometry to visualize')
         return False
 
+    geoms = create_o3d_geometries(merge_geometry_list(geometry_list))
+
     print(f'Total: {total_faces} faces, {total_edges} edges')
     print('Opening visualization window...')
     o3d.visualization.draw_geometries(geoms)
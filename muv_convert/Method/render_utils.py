@@ -0,0 +1,116 @@
+import numpy as np
+
+
+CORNER_COLOR = np.array([1.0, 0.0, 0.0])
+
+
+def get_face_points(face_pnts) -> tuple:
+    """
+    一次性取出所有面的有效采样点
+
+    Args:
+        face_pnts: (N, num_u, num_v, 3) 或 (N, num_u, num_v, 4)，第4维为mask
+
+    Returns:
+        (points, face_ids): (P, 3) 有效采样点及其所属面的编号
+    """
+    face_pnts = np.asarray(face_pnts)
+    if face_pnts.size == 0:
+        return np.zeros((0, 3)), np.zeros((0,), dtype=np.int64)
+
+    face_num = face_pnts.shape[0]
+    face_ids = np.broadcast_to(np.arange(face_num).reshape(-1, 1, 1), face_pnts.shape[:3])
+
+    if face_pnts.shape[-1] == 4:
+        valid = face_pnts[..., 3] == 1
+        return face_pnts[..., :3][valid], face_ids[valid]
+
+    return face_pnts.reshape(-1, 3), face_ids.reshape(-1)
+
+
+def get_edge_lines(edge_pnts) -> tuple:
+    """
+    将所有边的采样点首尾相连为线段
+
+    Args:
+        edge_pnts: (M, edge_num_u, 3)
+
+    Returns:
+        (points, lines, edge_ids): (M * edge_num_u, 3) 点，(M * (edge_num_u - 1), 2) 线段的点编号，线段所属边的编号
+    """
+    edge_pnts = np.asarray(edge_pnts)
+    if edge_pnts.size == 0:
+        return np.zeros((0, 3)), np.zeros((0, 2), dtype=np.int64), np.zeros((0,), dtype=np.int64)
+
+    edge_num, point_num = edge_pnts.shape[:2]
+    starts = (np.arange(edge_num).reshape(-1, 1) * point_num + np.arange(point_num - 1)).reshape(-1)
+    lines = np.stack([starts, starts + 1], axis=1)
+    edge_ids = np.repeat(np.arange(edge_num), point_num - 1)
+    return edge_pnts.reshape(-1, 3), lines, edge_ids
+
+
+def merge_geometry(
+    face_pnts,
+    edge_pnts,
+    edge_corner_pnts,
+    face_colors=None,
+    edge_colors=None,
+) -> dict:
+    """
+    将一个形状的所有面点、边和顶点合并为一组点和一组线段，颜色按面/边编号批量赋值
+
+    Args:
+        face_colors: (N, 3) 每个面的颜色，None表示随机
+        edge_colors: (M, 3) 每条边的颜色，None表示随机
+
+    Returns:
+        geometry:
+            - points, point_colors: 面的有效采样点和顶点，顶点为红色
+            - is_corner: (P,) 点是否为顶点
+            - line_points, lines, line_colors: 边的采样点、线段和线段颜色
+    """
+    face_points, face_ids = get_face_points(face_pnts)
+    line_points, lines, edge_ids = get_edge_lines(edge_pnts)
+
+    edge_num = 0 if np.asarray(edge_pnts).size == 0 else np.asarray(edge_pnts).shape[0]
+    face_num = 0 if np.asarray(face_pnts).size == 0 else np.asarray(face_pnts).shape[0]
+
+    if face_colors is None:
+        face_colors = np.random.rand(face_num, 3)
+    if edge_colors is None:
+        edge_colors = np.random.rand(edge_num, 3)
+
+    corner_points = np.asarray(edge_corner_pnts).reshape(-1, 3)
+
+    return {
+        'points': np.concatenate([face_points, corner_points], axis=0),
+        'point_colors': np.concatenate([
+            face_colors[face_ids].reshape(-1, 3),
+            np.tile(CORNER_COLOR, (corner_points.shape[0], 1)),
+        ], axis=0),
+        'is_corner': np.concatenate([
+            np.zeros(face_points.shape[0], dtype=bool),
+            np.ones(corner_points.shape[0], dtype=bool),
+        ]),
+        'line_points': line_points,
+        'lines': lines,
+        'line_colors': edge_colors[edge_ids].reshape(-1, 3),
+    }
+
+
+def merge_geometry_list(geometry_list: list) -> dict:
+    """
+    合并多个merge_geometry的结果，线段的点编号按偏移更新
+    """
+    line_point_nums = [geometry['line_points'].shape[0] for geometry in geometry_list]
+    offsets = np.concatenate([[0], np.cumsum(line_point_nums)[:-1]]).astype(np.int64)
+
+    return {
+        'points': np.concatenate([geometry['points'] for geometry in geometry_list], axis=0),
+        'point_colors': np.concatenate([geometry['point_colors'] for geometry in geometry_list], axis=0),
+        'is_corner': np.concatenate([geometry['is_corner'] for geometry in geometry_list], axis=0),
+        'line_points': np.concatenate([geometry['line_points'] for geometry in geometry_list], axis=0),
+        'lines': np.concatenate([
+            geometry['lines'] + offset for geometry, offset in zip(geometry_list, offsets)], axis=0),
+        'line_colors': np.concatenate([geometry['line_colors'] for geometry in geometry_list], axis=0),
+    }
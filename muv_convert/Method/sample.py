@@ -0,0 +1,300 @@
+import numpy as np
+from OCC.Core.gp import gp_Pnt2d
+from OCC.Core.BRep import BRep_Tool
+from OCC.Core.TopExp import TopExp_Explorer, topexp_FirstVertex, topexp_LastVertex
+from OCC.Core.TopoDS import topods_Edge
+from OCC.Core.GeomAbs import GeomAbs_Line, GeomAbs_Circle, GeomAbs_Ellipse
+from OCC.Core.TopAbs import TopAbs_WIRE, TopAbs_EDGE, TopAbs_REVERSED, TopAbs_IN, TopAbs_ON
+from OCC.Core.BRepAdaptor import BRepAdaptor_Surface, BRepAdaptor_Curve, BRepAdaptor_Curve2d
+from OCC.Core.BRepTools import breptools_UVBounds
+from OCC.Core.BRepTopAdaptor import BRepTopAdaptor_FClass2d
+
+from muv_convert.Method.instrument import add_count
+
+
+# 沿u、v方向均为线性的曲面，2x2采样即可精确双线性重建
+PLANAR_SURFACE_TYPES = ['plane']
+# 沿v方向为直线的直纹面，v方向2个采样即可精确线性重建
+RULED_SURFACE_TYPES = ['cylinder', 'cone', 'extrusion']
+
+
+def resample_grid(grid: np.ndarray, num_list: list) -> np.ndarray:
+    """
+    对等间距参数网格沿前len(num_list)个轴做线性插值重采样
+
+    Args:
+        grid: (n_0, n_1, ..., C) 等间距参数采样得到的网格
+        num_list: 每个轴的目标采样数
+
+    Returns:
+        grid: (num_list[0], num_list[1], ..., C) 重采样后的网格
+    """
+    for axis, num in enumerate(num_list):
+        src_num = grid.shape[axis]
+        if src_num == num:
+            continue
+
+        src_t = np.linspace(0.0, 1.0, src_num)
+        t = np.linspace(0.0, 1.0, num)
+        right = np.clip(np.searchsorted(src_t, t, side='right'), 1, src_num - 1)
+        left = right - 1
+        weight = (t - src_t[left]) / (src_t[right] - src_t[left])
+
+        weight_shape = [1] * grid.ndim
+        weight_shape[axis] = num
+        weight = weight.reshape(weight_shape)
+
+        grid = np.take(grid, left, axis=axis) * (1.0 - weight) + np.take(grid, right, axis=axis) * weight
+    return grid
+
+
+def interpolate_params(first: float, last: float, num: int) -> np.ndarray:
+    """
+    与occwl的Interval.interpolate一致的等间距参数
+    """
+    t = np.arange(num, dtype=np.float64) / (num - 1)
+    return (1.0 - t) * first + t * last
+
+
+def is_untrimmed_face(face_shape, uv_bounds: list, tol_ratio: float = 1e-7) -> bool:
+    """
+    判断面是否未被裁剪，即唯一的边界环完全落在uv包围盒的边界上
+    此时uv包围盒内的所有采样点均在面内，无需逐点分类
+
+    Args:
+        face_shape: TopoDS_Face
+        uv_bounds: [umin, umax, vmin, vmax]
+        tol_ratio: 相对于uv包围盒尺寸的容差
+
+    Returns:
+        bool: 是否未被裁剪
+    """
+    umin, umax, vmin, vmax = uv_bounds
+    u_tol = tol_ratio * max(umax - umin, 1.0)
+    v_tol = tol_ratio * max(vmax - vmin, 1.0)
+
+    wire_num = 0
+    exp_wire = TopExp_Explorer(face_shape, TopAbs_WIRE)
+    while exp_wire.More():
+        wire_num += 1
+        exp_wire.Next()
+    if wire_num != 1:
+        return False
+
+    exp_edge = TopExp_Explorer(face_shape, TopAbs_EDGE)
+    while exp_edge.More():
+        curve2d = BRepAdaptor_Curve2d(topods_Edge(exp_edge.Current()), face_shape)
+        ts = interpolate_params(curve2d.FirstParameter(), curve2d.LastParameter(), 5)
+        uvs = np.array([[curve2d.Value(t).X(), curve2d.Value(t).Y()] for t in ts])
+
+        # 每条边的pcurve必须是uv包围盒某一条边上的等参线
+        on_boundary = np.all(np.abs(uvs[:, 0] - umin) < u_tol) or \
+            np.all(np.abs(uvs[:, 0] - umax) < u_tol) or \
+            np.all(np.abs(uvs[:, 1] - vmin) < v_tol) or \
+            np.all(np.abs(uvs[:, 1] - vmax) < v_tol)
+        if not on_boundary:
+            return False
+        exp_edge.Next()
+
+    return True
+
+
+def sample_face_uvgrid(
+    face,
+    num_u: int = 32,
+    num_v: int = 32,
+    point_num_u: int = None,
+    point_num_v: int = None,
+) -> np.ndarray:
+    """
+    单次遍历uv网格，同时计算点坐标和裁剪状态
+    每个面只构建一次曲面适配器和分类器，未裁剪的面跳过分类
+    采样顺序、面反向时的u方向翻转均与occwl.uvgrid一致
+
+    Args:
+        face: occwl Face
+        num_u: u方向采样数
+        num_v: v方向采样数
+        point_num_u: u方向点坐标采样数，只能为2或num_u，为2时只计算两端后线性重采样
+        point_num_v: v方向点坐标采样数，只能为2或num_v
+
+    Returns:
+        face_feat: (num_u, num_v, 4) 前3维是xyz坐标，第4维是mask
+    """
+    if point_num_u is None:
+        point_num_u = num_u
+    if point_num_v is None:
+        point_num_v = num_v
+    assert point_num_u in [2, num_u]
+    assert point_num_v in [2, num_v]
+
+    face_shape = face.topods_shape()
+    umin, umax, vmin, vmax = breptools_UVBounds(face_shape)
+    us = interpolate_params(umin, umax, num_u).tolist()
+    vs = interpolate_params(vmin, vmax, num_v).tolist()
+
+    point_u_idxs = [0, num_u - 1] if point_num_u == 2 else list(range(num_u))
+    point_v_idxs = [0, num_v - 1] if point_num_v == 2 else list(range(num_v))
+    point_u_pos = {idx: pos for pos, idx in enumerate(point_u_idxs)}
+    point_v_pos = {idx: pos for pos, idx in enumerate(point_v_idxs)}
+
+    surface = BRepAdaptor_Surface(face_shape)
+
+    classifier = None
+    if not is_untrimmed_face(face_shape, [umin, umax, vmin, vmax]):
+        classifier = BRepTopAdaptor_FClass2d(face_shape, 1e-9)
+
+    points = np.zeros((len(point_u_idxs), len(point_v_idxs), 3))
+    mask = np.ones((num_u, num_v, 1), dtype=bool)
+    for i, u in enumerate(us):
+        u_pos = point_u_pos.get(i)
+        for j, v in enumerate(vs):
+            if u_pos is not None:
+                v_pos = point_v_pos.get(j)
+                if v_pos is not None:
+                    pnt = surface.Value(u, v)
+                    points[u_pos, v_pos] = [pnt.X(), pnt.Y(), pnt.Z()]
+
+            if classifier is not None:
+                state = classifier.Perform(gp_Pnt2d(u, v))
+                mask[i, j, 0] = state == TopAbs_IN or state == TopAbs_ON
+
+    points = resample_grid(points, [num_u, num_v])
+
+    if face_shape.Orientation() == TopAbs_REVERSED:
+        points = points[::-1]
+        mask = mask[::-1]
+
+    return np.concatenate((points, mask), axis=-1)
+
+
+def sample_faces(
+    face_dict: dict,
+    num_u: int = 32,
+    num_v: int = 32,
+    adaptive: bool = False,
+) -> np.ndarray:
+    """
+    在每个面的uv参数域上均匀采样点坐标和裁剪mask
+
+    Args:
+        face_dict: 面字典，值为(surface_type, face)
+        num_u: u方向采样数
+        num_v: v方向采样数
+        adaptive: 是否对平面、直纹面降低点坐标采样数后线性重采样到输出网格
+
+    Returns:
+        face_pnts: (N, num_u, num_v, 4) 前3维是xyz坐标，第4维是mask
+    """
+    graph_face_feat = {}
+    for face_idx, face_feature in face_dict.items():
+        surface_type, face = face_feature
+        try:
+            point_num_u = num_u
+            point_num_v = num_v
+            if adaptive:
+                if surface_type in PLANAR_SURFACE_TYPES:
+                    point_num_u = 2
+                    point_num_v = 2
+                elif surface_type in RULED_SURFACE_TYPES:
+                    point_num_v = 2
+
+            graph_face_feat[face_idx] = sample_face_uvgrid(
+                face, num_u, num_v, point_num_u, point_num_v)
+        except Exception as e:
+            print(f"Warning: Failed to sample face {face_idx}: {e}")
+            add_count('face_sample_fail_num')
+            # 使用零填充
+            graph_face_feat[face_idx] = np.zeros((num_u, num_v, 4))
+
+    if len(graph_face_feat) > 0:
+        face_pnts = np.stack([x for x in graph_face_feat.values()])
+    else:
+        face_pnts = np.array([]).reshape(0, num_u, num_v, 4)
+    return face_pnts
+
+
+def gp_to_numpy(pnt) -> np.ndarray:
+    return np.array([pnt.X(), pnt.Y(), pnt.Z()])
+
+
+def sample_edge_points(edge_shape, num_u: int = 32) -> tuple:
+    """
+    构建一次曲线适配器并按曲线类型采样，直线、圆、椭圆由解析式批量计算，其余曲线逐点求值
+    参数取值、边反向时的顺序翻转均与occwl.uvgrid.ugrid一致
+    端点取自拓扑顶点，考虑边的方向
+
+    Args:
+        edge_shape: TopoDS_Edge
+        num_u: 采样数
+
+    Returns:
+        (points, corners): (num_u, 3) 采样点，(2, 3) 起始和终止顶点
+    """
+    corners = np.stack([
+        gp_to_numpy(BRep_Tool.Pnt(topexp_FirstVertex(edge_shape, True))),
+        gp_to_numpy(BRep_Tool.Pnt(topexp_LastVertex(edge_shape, True))),
+    ])
+
+    # 退化边没有3D曲线，所有采样点都在顶点上
+    if BRep_Tool.Degenerated(edge_shape):
+        return np.tile(corners[0], (num_u, 1)), corners
+
+    curve = BRepAdaptor_Curve(edge_shape)
+    us = interpolate_params(curve.FirstParameter(), curve.LastParameter(), num_u)
+
+    curve_type = curve.GetType()
+    if curve_type == GeomAbs_Line:
+        line = curve.Line()
+        points = gp_to_numpy(line.Location()) + us[:, None] * gp_to_numpy(line.Direction())
+    elif curve_type in [GeomAbs_Circle, GeomAbs_Ellipse]:
+        if curve_type == GeomAbs_Circle:
+            conic = curve.Circle()
+            major_radius = minor_radius = conic.Radius()
+        else:
+            conic = curve.Ellipse()
+            major_radius = conic.MajorRadius()
+            minor_radius = conic.MinorRadius()
+
+        axis = conic.Position()
+        points = gp_to_numpy(axis.Location()) + \
+            (major_radius * np.cos(us))[:, None] * gp_to_numpy(axis.XDirection()) + \
+            (minor_radius * np.sin(us))[:, None] * gp_to_numpy(axis.YDirection())
+    else:
+        points = np.array([gp_to_numpy(curve.Value(u)) for u in us.tolist()])
+
+    if edge_shape.Orientation() == TopAbs_REVERSED:
+        points = points[::-1]
+
+    return points, corners
+
+
+def sample_edges(
+    edge_dict: dict,
+    num_u: int = 32,
+):
+    """
+    在每条边的参数域上均匀采样点坐标，直线、圆、椭圆由解析式计算，无需自适应降低采样数
+
+    Args:
+        edge_dict: 边字典，值为edge
+        num_u: 采样数
+
+    Returns:
+        edge_pnts: (M, num_u, 3) 边采样点
+        edge_corner_pnts: (M, 2, 3) 边的起始和终止顶点
+    """
+    edge_num = len(edge_dict)
+    edge_pnts = np.zeros((edge_num, num_u, 3))
+    edge_corner_pnts = np.zeros((edge_num, 2, 3))
+    for i, (edge_idx, edge) in enumerate(edge_dict.items()):
+        try:
+            edge_pnts[i], edge_corner_pnts[i] = sample_edge_points(edge.topods_shape(), num_u)
+        except Exception as e:
+            print(f"Warning: Failed to sample edge {edge_idx}: {e}")
+            add_count('edge_sample_fail_num')
+            # 使用零填充
+            edge_pnts[i] = 0.0
+            edge_corner_pnts[i] = 0.0
+
+    return edge_pnts, edge_corner_pnts
@@ -0,0 +1,254 @@
+import numpy as np
+
+from muv_convert.Config.constant import SCHEMA_VERSION
+
+
+# 坐标的存储类型，'uint16'表示相对形状包围盒量化为16位整数
+COORD_DTYPE_LIST = ['float32', 'float16', 'uint16']
+
+# 坐标数组，紧凑格式中按coord_dtype存储
+COORD_KEY_LIST = ['face_xyz', 'edge_pnts', 'edge_corner_pnts', 'corner_unique']
+
+# 索引数组，紧凑格式中按取值范围存储为int16或int32
+INDEX_KEY_LIST = ['edgeFace_adj', 'edgeCorner_adj', 'faceEdge_indptr', 'faceEdge_indices']
+
+# normalize时输出的包围盒和归一化局部坐标，局部坐标在[-1, 1]内，量化时使用固定范围
+BBOX_KEY_LIST = ['shape_bbox', 'face_bbox', 'edge_bbox']
+NCS_KEY_LIST = ['face_ncs', 'edge_ncs']
+NCS_RANGE = np.array([[-1.0, -1.0, -1.0], [1.0, 1.0, 1.0]], dtype=np.float32)
+
+QUANTIZE_MAX = 65535
+
+
+def get_array_dtype(key: str, coord_dtype=None):
+    """
+    打包时各数组的存储类型，按键名确定，不依赖某个形状的数组，空数组也能得到正确的类型
+
+    Args:
+        coord_dtype: 紧凑格式的坐标存储类型，None表示parse_shape的原始输出格式
+
+    Returns:
+        dtype: 未知的键返回None
+    """
+    if key in INDEX_KEY_LIST:
+        # 紧凑格式按单个形状的取值范围选择int16或int32，打包时统一为int32
+        return np.dtype(np.int64 if coord_dtype is None else np.int32)
+    # parse_shape输出的坐标均为float32
+    if key == 'face_pnts' or key in COORD_KEY_LIST or key in NCS_KEY_LIST:
+        return np.dtype(np.float32 if coord_dtype is None else coord_dtype)
+    if key == 'coord_range' or key in BBOX_KEY_LIST:
+        return np.dtype(np.float32)
+    if key == 'face_mask':
+        return np.dtype(np.uint8)
+    return None
+
+
+def is_compact_data(data: dict) -> bool:
+    return 'schema_version' in data
+
+
+def get_index_dtype(max_value: int):
+    """
+    能表示[-1, max_value]的最小有符号整数类型，-1用于表示无效邻接
+    """
+    if max_value <= np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def pack_face_mask(face_mask) -> np.ndarray:
+    """
+    Args:
+        face_mask: (N, num_u, num_v) 面采样点的mask，非0为有效
+
+    Returns:
+        face_mask_bits: (N, ceil(num_u * num_v / 8)) uint8，按位打包
+    """
+    # 面数为0时无法由-1推断列数，按mask的形状显式给出
+    face_num, num_u, num_v = face_mask.shape[:3]
+    return np.packbits(face_mask.reshape(face_num, num_u * num_v) > 0.5, axis=1)
+
+
+def unpack_face_mask(face_mask_bits: np.ndarray, num_u: int, num_v: int) -> np.ndarray:
+    """
+    Returns:
+        face_mask: (N, num_u, num_v) bool
+    """
+    face_num = face_mask_bits.shape[0]
+    face_mask = np.unpackbits(face_mask_bits, axis=1, count=num_u * num_v)
+    return face_mask.reshape(face_num, num_u, num_v).astype(bool)
+
+
+def get_coord_range(coord_list: list) -> np.ndarray:
+    """
+    所有坐标数组的包围盒
+
+    Returns:
+        coord_range: (2, 3) float32，第0行为最小值，第1行为最大值
+    """
+    coords = np.concatenate([coords.reshape(-1, 3) for coords in coord_list], axis=0)
+    if coords.shape[0] == 0:
+        return np.zeros((2, 3), dtype=np.float32)
+
+    return np.stack([coords.min(axis=0), coords.max(axis=0)]).astype(np.float32)
+
+
+def quantize_coords(coords: np.ndarray, coord_range: np.ndarray) -> np.ndarray:
+    scale = coord_range[1] - coord_range[0]
+    scale[scale == 0] = 1.0
+    quantized = np.rint((coords - coord_range[0]) / scale * QUANTIZE_MAX)
+    return np.clip(quantized, 0, QUANTIZE_MAX).astype(np.uint16)
+
+
+def dequantize_coords(quantized: np.ndarray, coord_range: np.ndarray) -> np.ndarray:
+    coord_range = coord_range.astype(np.float32)
+    scale = coord_range[1] - coord_range[0]
+    scale[scale == 0] = 1.0
+    return (quantized.astype(np.float32) / QUANTIZE_MAX * scale + coord_range[0]).astype(np.float32)
+
+
+def compact_shape_data(data: dict, coord_dtype: str = 'float32') -> dict:
+    """
+    将parse_shape的输出转换为紧凑格式
+        - face_pnts拆分为face_xyz和按位打包的face_mask
+        - 邻接索引按取值范围存储为int16或int32
+        - 坐标可选存储为float16，或相对形状包围盒量化为uint16
+        - 不保存list形式的faceEdge_adj，由faceEdge_indptr/faceEdge_indices表示
+
+    Args:
+        data: parse_shape输出的数据
+        coord_dtype: 'float32', 'float16' 或 'uint16'
+
+    Returns:
+        compact_data: 紧凑格式的数据
+            - schema_version: 格式版本
+            - coord_dtype: 坐标的存储类型
+            - face_xyz: (N, num_u, num_v, 3) 面采样点坐标
+            - face_mask: (N, ceil(num_u * num_v / 8)) uint8 按位打包的面采样点mask
+            - edge_pnts, edge_corner_pnts, corner_unique: 坐标
+            - edgeFace_adj, edgeCorner_adj, faceEdge_indptr, faceEdge_indices: 索引
+            - coord_range: (2, 3) 量化使用的包围盒，仅coord_dtype为'uint16'时输出
+            - shape_bbox, face_bbox, edge_bbox, face_ncs, edge_ncs: 仅输入包含归一化结果时输出
+    """
+    if coord_dtype not in COORD_DTYPE_LIST:
+        print('[ERROR][schema::compact_shape_data]')
+        print('\t coord_dtype not valid!')
+        print('\t coord_dtype:', coord_dtype, ', valid:', COORD_DTYPE_LIST)
+        return None
+
+    face_pnts = data['face_pnts']
+    face_num = face_pnts.shape[0]
+    edge_num = data['edge_pnts'].shape[0]
+    corner_num = data['corner_unique'].shape[0]
+
+    coord_dict = {
+        'face_xyz': face_pnts[..., :3],
+        'edge_pnts': data['edge_pnts'],
+        'edge_corner_pnts': data['edge_corner_pnts'],
+        'corner_unique': data['corner_unique'],
+    }
+
+    compact_data = {
+        'schema_version': SCHEMA_VERSION,
+        'coord_dtype': coord_dtype,
+    }
+
+    if coord_dtype == 'uint16':
+        coord_range = get_coord_range(list(coord_dict.values()))
+        compact_data['coord_range'] = coord_range
+        for key, coords in coord_dict.items():
+            compact_data[key] = quantize_coords(coords, coord_range)
+    else:
+        for key, coords in coord_dict.items():
+            compact_data[key] = np.ascontiguousarray(coords, dtype=coord_dtype)
+
+    if face_pnts.shape[-1] == 4:
+        compact_data['face_mask'] = pack_face_mask(face_pnts[..., 3])
+    else:
+        compact_data['face_mask'] = pack_face_mask(np.ones(face_pnts.shape[:3], dtype=bool))
+
+    max_value_dict = {
+        'edgeFace_adj': face_num,
+        'edgeCorner_adj': corner_num,
+        'faceEdge_indptr': 2 * edge_num,
+        'faceEdge_indices': edge_num,
+    }
+    for key in INDEX_KEY_LIST:
+        compact_data[key] = np.asarray(data[key]).astype(get_index_dtype(max_value_dict[key]))
+
+    for key in BBOX_KEY_LIST:
+        if key in data:
+            compact_data[key] = data[key].astype(np.float32)
+
+    for key in NCS_KEY_LIST:
+        if key not in data:
+            continue
+        if coord_dtype == 'uint16':
+            compact_data[key] = quantize_coords(data[key], NCS_RANGE.copy())
+        else:
+            compact_data[key] = np.ascontiguousarray(data[key], dtype=coord_dtype)
+
+    return compact_data
+
+
+def get_compact_key_list(key_list: list) -> list:
+    """
+    只读取部分数组时，为了由紧凑格式还原出key_list中的数组需要读取的数组
+    对非紧凑格式的数据，多出的键不存在，不影响读取结果
+    """
+    compact_key_list = [key for key in key_list if key != 'face_pnts']
+    if 'face_pnts' in key_list:
+        compact_key_list += ['face_xyz', 'face_mask']
+    compact_key_list.append('coord_range')
+    return list(dict.fromkeys(compact_key_list))
+
+
+def expand_shape_data(data: dict, face_edge_list: bool = False) -> dict:
+    """
+    将紧凑格式还原为parse_shape的输出格式，非紧凑格式的数据原样返回
+    只读取了部分数组时只还原存在的数组，face_pnts需要face_xyz和face_mask同时存在
+
+    Args:
+        face_edge_list: 是否由CSR恢复list形式的faceEdge_adj
+    """
+    if not is_compact_data(data):
+        return data
+
+    coord_dict = {}
+    for key in COORD_KEY_LIST:
+        if key not in data:
+            continue
+        if data['coord_dtype'] == 'uint16':
+            coord_dict[key] = dequantize_coords(data[key], data['coord_range'])
+        else:
+            coord_dict[key] = data[key].astype(np.float32)
+
+    expand_data = {}
+    if 'face_xyz' in coord_dict and 'face_mask' in data:
+        face_xyz = coord_dict.pop('face_xyz')
+        face_mask = unpack_face_mask(data['face_mask'], face_xyz.shape[1], face_xyz.shape[2])
+        expand_data['face_pnts'] = np.concatenate([face_xyz, face_mask[..., None].astype(np.float32)], axis=-1)
+    coord_dict.pop('face_xyz', None)
+    expand_data.update(coord_dict)
+
+    for key in INDEX_KEY_LIST:
+        if key in data:
+            expand_data[key] = data[key].astype(np.int64)
+
+    for key in BBOX_KEY_LIST:
+        if key in data:
+            expand_data[key] = data[key].astype(np.float32)
+
+    for key in NCS_KEY_LIST:
+        if key not in data:
+            continue
+        if data['coord_dtype'] == 'uint16':
+            expand_data[key] = dequantize_coords(data[key], NCS_RANGE)
+        else:
+            expand_data[key] = data[key].astype(np.float32)
+
+    if face_edge_list and 'faceEdge_indptr' in expand_data and 'faceEdge_indices' in expand_data:
+        expand_data['faceEdge_adj'] = np.split(
+            expand_data['faceEdge_indices'], expand_data['faceEdge_indptr'][1:-1])
+
+    return expand_data
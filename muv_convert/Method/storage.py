@@ -0,0 +1,261 @@
+import os
+import json
+import struct
+import pickle
+import numpy as np
+from typing import Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from muv_convert.Method.pkl import iter_pkl_file
+
+
+# 存储格式与文件后缀
+BACKEND_EXT_DICT = {
+    'pkl': '.pkl',
+    'npz': '.npz',
+    'zstd': '.muvz',
+}
+
+# zstd格式:
+#   MAGIC(4字节) + 头部长度(uint32, 小端) + 头部json + 各数组独立压缩的数据块
+#   头部记录每个形状的类型、非数组字段，以及每个数组的dtype、形状和数据块的偏移、长度
+#   各数组单独压缩，读取时可以只解压需要的数组
+ZSTD_MAGIC = b'MUVZ'
+ZSTD_VERSION = 1
+
+
+def get_backend_by_path(file_path: str) -> Union[str, None]:
+    for backend, ext in BACKEND_EXT_DICT.items():
+        if file_path.endswith(ext):
+            return backend
+    return None
+
+
+def split_data(data: dict) -> tuple:
+    """
+    Returns:
+        (array_dict, field_dict): np.ndarray类型的值和其余可json序列化的值
+    """
+    array_dict = {}
+    field_dict = {}
+    for key, value in data.items():
+        if isinstance(value, np.ndarray):
+            array_dict[key] = value
+        elif isinstance(value, (list, tuple)) and len(value) > 0 and isinstance(value[0], np.ndarray):
+            # 旧格式list形式的faceEdge_adj不能保存为单个数组，由CSR数组表示
+            continue
+        else:
+            field_dict[key] = value
+    return array_dict, field_dict
+
+
+def save_npz_file(shape_data_list: list, save_file_path: str, compress: bool = True) -> bool:
+    array_dict = {}
+    meta = {'shapes': []}
+    for i, shape_data in enumerate(shape_data_list):
+        shape_array_dict, field_dict = split_data(shape_data['data'])
+        for key, value in shape_array_dict.items():
+            array_dict[str(i) + '/' + key] = value
+
+        meta['shapes'].append({
+            'type': shape_data['type'],
+            'fields': field_dict,
+            'keys': list(shape_array_dict.keys()),
+        })
+
+    array_dict['__meta__'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+
+    # 传入文件对象，避免np.savez自动追加.npz后缀
+    with open(save_file_path, 'wb') as f:
+        if compress:
+            np.savez_compressed(f, **array_dict)
+        else:
+            np.savez(f, **array_dict)
+    return True
+
+
+def load_npz_file(file_path: str, key_list: Union[list, None] = None) -> list:
+    shape_data_list = []
+    with np.load(file_path, allow_pickle=False) as npz:
+        meta = json.loads(npz['__meta__'].tobytes().decode('utf-8'))
+        for i, shape_info in enumerate(meta['shapes']):
+            data = dict(shape_info['fields'])
+            for key in shape_info['keys']:
+                if key_list is not None and key not in key_list:
+                    continue
+                data[key] = npz[str(i) + '/' + key]
+
+            shape_data_list.append({
+                'type': shape_info['type'],
+                'data': data,
+            })
+    return shape_data_list
+
+
+def save_zstd_file(shape_data_list: list, save_file_path: str, level: int = 3) -> bool:
+    if zstandard is None:
+        print('[ERROR][storage::save_zstd_file]')
+        print('\t zstandard not installed! please run: pip install zstandard')
+        return False
+
+    compressor = zstandard.ZstdCompressor(level=level)
+
+    header = {
+        'version': ZSTD_VERSION,
+        'shapes': [],
+    }
+    chunk_list = []
+    offset = 0
+    for shape_data in shape_data_list:
+        array_dict, field_dict = split_data(shape_data['data'])
+
+        array_info_dict = {}
+        for key, value in array_dict.items():
+            value = np.ascontiguousarray(value)
+            chunk = compressor.compress(value.tobytes())
+            array_info_dict[key] = {
+                'dtype': value.dtype.str,
+                'shape': list(value.shape),
+                'offset': offset,
+                'size': len(chunk),
+            }
+            chunk_list.append(chunk)
+            offset += len(chunk)
+
+        header['shapes'].append({
+            'type': shape_data['type'],
+            'fields': field_dict,
+            'arrays': array_info_dict,
+        })
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    with open(save_file_path, 'wb') as f:
+        f.write(ZSTD_MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        for chunk in chunk_list:
+            f.write(chunk)
+    return True
+
+
+def load_zstd_header(f) -> Union[tuple, None]:
+    """
+    Returns:
+        (header, data_start): 头部信息和数据块起始位置，格式不正确时返回None
+    """
+    if f.read(4) != ZSTD_MAGIC:
+        return None
+
+    header_size = struct.unpack('<I', f.read(4))[0]
+    header = json.loads(f.read(header_size).decode('utf-8'))
+    return header, 8 + header_size
+
+
+def load_zstd_file(file_path: str, key_list: Union[list, None] = None) -> Union[list, None]:
+    if zstandard is None:
+        print('[ERROR][storage::load_zstd_file]')
+        print('\t zstandard not installed! please run: pip install zstandard')
+        return None
+
+    decompressor = zstandard.ZstdDecompressor()
+
+    shape_data_list = []
+    with open(file_path, 'rb') as f:
+        header_info = load_zstd_header(f)
+        if header_info is None:
+            print('[ERROR][storage::load_zstd_file]')
+            print('\t not a zstd shape file!')
+            print('\t file_path:', file_path)
+            return None
+
+        header, data_start = header_info
+        for shape_info in header['shapes']:
+            data = dict(shape_info['fields'])
+            for key, array_info in shape_info['arrays'].items():
+                if key_list is not None and key not in key_list:
+                    continue
+
+                f.seek(data_start + array_info['offset'])
+                dtype = np.dtype(array_info['dtype'])
+                shape = tuple(array_info['shape'])
+                raw = decompressor.decompress(
+                    f.read(array_info['size']),
+                    max_output_size=int(np.prod(shape)) * dtype.itemsize,
+                )
+                data[key] = np.frombuffer(raw, dtype=dtype).reshape(shape)
+
+            shape_data_list.append({
+                'type': shape_info['type'],
+                'data': data,
+            })
+    return shape_data_list
+
+
+def save_shape_file(shape_data_list: list, save_file_path: str, backend: str = 'pkl') -> bool:
+    """
+    按指定格式保存形状数据列表
+
+    Args:
+        shape_data_list: 形状数据列表，每个元素包含'type'和'data'
+        save_file_path: 保存路径，后缀不做检查，读取时按后缀判断格式
+        backend: 'pkl', 'npz' 或 'zstd'
+    """
+    if backend == 'pkl':
+        with open(save_file_path, 'wb') as f:
+            pickle.dump(shape_data_list, f)
+        return True
+
+    if backend == 'npz':
+        return save_npz_file(shape_data_list, save_file_path)
+
+    if backend == 'zstd':
+        return save_zstd_file(shape_data_list, save_file_path)
+
+    print('[ERROR][storage::save_shape_file]')
+    print('\t backend not valid!')
+    print('\t backend:', backend, ', valid:', list(BACKEND_EXT_DICT.keys()))
+    return False
+
+
+def load_shape_file(
+    file_path: str,
+    backend: Union[str, None] = None,
+    key_list: Union[list, None] = None,
+) -> Union[list, None]:
+    """
+    读取形状数据列表，npz和zstd格式不会执行任意代码，可以读取来源不可信的文件
+
+    Args:
+        backend: None表示按后缀判断格式
+        key_list: 只读取指定的数组，None表示全部，对pkl格式无效
+
+    Returns:
+        shape_data_list: 形状数据列表，读取失败时返回None
+    """
+    if not os.path.exists(file_path):
+        print('[ERROR][storage::load_shape_file]')
+        print('\t shape file not exist!')
+        print('\t file_path:', file_path)
+        return None
+
+    if backend is None:
+        backend = get_backend_by_path(file_path)
+
+    if backend == 'pkl':
+        return list(iter_pkl_file(file_path))
+
+    if backend == 'npz':
+        return load_npz_file(file_path, key_list)
+
+    if backend == 'zstd':
+        return load_zstd_file(file_path, key_list)
+
+    print('[ERROR][storage::load_shape_file]')
+    print('\t backend not valid!')
+    print('\t backend:', backend, ', file_path:', file_path)
+    return None
+
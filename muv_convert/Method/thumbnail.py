@@ -0,0 +1,219 @@
+import zlib
+import struct
+import numpy as np
+
+
+BACKGROUND_COLOR = np.array([255, 255, 255], dtype=np.uint8)
+EDGE_COLOR = np.array([0.1, 0.1, 0.1])
+
+
+def write_png(save_png_file_path: str, image: np.ndarray) -> bool:
+    """
+    不依赖图像库写入RGB格式PNG
+
+    Args:
+        image: (H, W, 3) uint8
+    """
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+
+    # 每行前加过滤类型0
+    raw = np.concatenate([np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)], axis=1)
+
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + chunk_type + data + \
+            struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+
+    with open(save_png_file_path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+    return True
+
+
+def get_view_rotation(azimuth: float = 45.0, elevation: float = 30.0) -> np.ndarray:
+    """
+    Returns:
+        rotation: (3, 3) 世界坐标到相机坐标的旋转，相机看向-z方向
+    """
+    azimuth = np.deg2rad(azimuth)
+    elevation = np.deg2rad(elevation)
+
+    rot_z = np.array([
+        [np.cos(azimuth), -np.sin(azimuth), 0.0],
+        [np.sin(azimuth), np.cos(azimuth), 0.0],
+        [0.0, 0.0, 1.0],
+    ])
+    # 先绕z轴旋转，再将z轴转到屏幕上方并按仰角倾斜
+    rot_x = np.array([
+        [1.0, 0.0, 0.0],
+        [0.0, np.sin(elevation), np.cos(elevation)],
+        [0.0, -np.cos(elevation), np.sin(elevation)],
+    ])
+    return rot_x @ rot_z
+
+
+def densify_lines(line_points: np.ndarray, lines: np.ndarray, sample_num: int) -> tuple:
+    """
+    在每条线段上均匀插值sample_num个点
+
+    Returns:
+        (points, line_ids): (L * sample_num, 3) 插值点及其所属线段编号
+    """
+    if lines.shape[0] == 0:
+        return np.zeros((0, 3)), np.zeros((0,), dtype=np.int64)
+
+    t = np.linspace(0.0, 1.0, sample_num).reshape(1, -1, 1)
+    starts = line_points[lines[:, 0]][:, None]
+    ends = line_points[lines[:, 1]][:, None]
+    points = starts + (ends - starts) * t
+    line_ids = np.repeat(np.arange(lines.shape[0]), sample_num)
+    return points.reshape(-1, 3), line_ids
+
+
+def rasterize_points(
+    image: np.ndarray,
+    depth: np.ndarray,
+    pixels: np.ndarray,
+    point_depth: np.ndarray,
+    colors: np.ndarray,
+    radius: int = 0,
+) -> bool:
+    """
+    带深度测试地将点写入图像，同一像素保留最近的点，全部为批量运算
+
+    Args:
+        image: (H, W, 3) uint8，原地修改
+        depth: (H, W) 深度缓冲，越小越近，原地修改
+        pixels: (P, 2) 像素坐标 (x, y)
+        point_depth: (P,) 深度
+        colors: (P, 3) uint8
+        radius: 点的半径（像素），0表示单像素
+    """
+    height, width = depth.shape
+
+    if radius > 0:
+        offset = np.arange(-radius, radius + 1)
+        offsets = np.stack(np.meshgrid(offset, offset, indexing='ij'), axis=-1).reshape(-1, 2)
+        pixels = (pixels[:, None] + offsets[None]).reshape(-1, 2)
+        point_depth = np.repeat(point_depth, offsets.shape[0])
+        colors = np.repeat(colors, offsets.shape[0], axis=0)
+
+    valid = (pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)
+    pixels = pixels[valid]
+    point_depth = point_depth[valid]
+    colors = colors[valid]
+    if pixels.shape[0] == 0:
+        return True
+
+    pixel_idxs = pixels[:, 1] * width + pixels[:, 0]
+
+    # 按深度排序后每个像素取第一个点，即最近的点
+    order = np.lexsort((point_depth, pixel_idxs))
+    pixel_idxs = pixel_idxs[order]
+    first = np.ones(pixel_idxs.shape[0], dtype=bool)
+    first[1:] = pixel_idxs[1:] != pixel_idxs[:-1]
+    pixel_idxs = pixel_idxs[first]
+    point_depth = point_depth[order][first]
+    colors = colors[order][first]
+
+    depth_flat = depth.reshape(-1)
+    closer = point_depth < depth_flat[pixel_idxs]
+    depth_flat[pixel_idxs[closer]] = point_depth[closer]
+    image.reshape(-1, 3)[pixel_idxs[closer]] = colors[closer]
+    return True
+
+
+def render_geometry(
+    geometry: dict,
+    image_size: int = 256,
+    azimuth: float = 45.0,
+    elevation: float = 30.0,
+    margin: float = 0.05,
+) -> np.ndarray:
+    """
+    将merge_geometry的结果正交投影为图像，面点按深度加暗，边为深色，顶点为红色
+
+    Returns:
+        image: (image_size, image_size, 3) uint8
+    """
+    image = np.tile(BACKGROUND_COLOR, (image_size, image_size, 1))
+    depth = np.full((image_size, image_size), np.inf)
+
+    edge_points, _ = densify_lines(geometry['line_points'], geometry['lines'], 8)
+    all_points = np.concatenate([geometry['points'].reshape(-1, 3), edge_points], axis=0)
+    if all_points.shape[0] == 0:
+        return image
+
+    rotation = get_view_rotation(azimuth, elevation)
+    view_points = all_points @ rotation.T
+
+    min_point = view_points.min(axis=0)
+    max_point = view_points.max(axis=0)
+    center = (min_point + max_point) / 2.0
+    extent = max(float((max_point - min_point)[:2].max()), 1e-9)
+    scale = image_size * (1.0 - 2.0 * margin) / extent
+
+    pixels = np.empty((view_points.shape[0], 2), dtype=np.int64)
+    pixels[:, 0] = np.floor((view_points[:, 0] - center[0]) * scale + image_size / 2.0)
+    # 图像y轴向下
+    pixels[:, 1] = np.floor(image_size / 2.0 - (view_points[:, 1] - center[1]) * scale)
+    # 相机看向-z方向，z越大越近
+    point_depth = -view_points[:, 2]
+
+    depth_range = max(float(max_point[2] - min_point[2]), 1e-9)
+    shade = 0.6 + 0.4 * (view_points[:, 2] - min_point[2]) / depth_range
+
+    point_num = geometry['points'].shape[0]
+    corner_mask = geometry['is_corner']
+
+    face_colors = geometry['point_colors'] * shade[:point_num, None]
+    # 边和顶点略微靠前绘制，避免被所在的面遮挡
+    bias = 1e-3 * depth_range
+
+    rasterize_points(
+        image, depth,
+        pixels[:point_num][~corner_mask],
+        point_depth[:point_num][~corner_mask],
+        (face_colors[~corner_mask] * 255).astype(np.uint8),
+    )
+    rasterize_points(
+        image, depth,
+        pixels[point_num:],
+        point_depth[point_num:] - bias,
+        np.tile((EDGE_COLOR * 255).astype(np.uint8), (edge_points.shape[0], 1)),
+    )
+    rasterize_points(
+        image, depth,
+        pixels[:point_num][corner_mask],
+        point_depth[:point_num][corner_mask] - 2.0 * bias,
+        (geometry['point_colors'][corner_mask] * 255).astype(np.uint8),
+        radius=1,
+    )
+    return image
+
+
+def create_contact_sheet(image_list: list, col_num: int = 8, padding: int = 2) -> np.ndarray:
+    """
+    将多张相同大小的图像按行列拼接
+
+    Returns:
+        sheet: (row_num * (H + padding) + padding, col_num * (W + padding) + padding, 3) uint8
+    """
+    if len(image_list) == 0:
+        return np.tile(BACKGROUND_COLOR, (1, 1, 1))
+
+    height, width = image_list[0].shape[:2]
+    col_num = min(col_num, len(image_list))
+    row_num = (len(image_list) + col_num - 1) // col_num
+
+    sheet = np.full(
+        (row_num * (height + padding) + padding, col_num * (width + padding) + padding, 3),
+        200, dtype=np.uint8)
+    for i, image in enumerate(image_list):
+        row, col = divmod(i, col_num)
+        y = padding + row * (height + padding)
+        x = padding + col * (width + padding)
+        sheet[y:y + height, x:x + width] = image
+    return sheet
@@ -0,0 +1,133 @@
+import os
+from time import time
+
+from muv_convert.Method.convert import igs_to_step
+from muv_convert.Method.batch import (
+    find_files,
+    run_isolated_tasks,
+    append_manifest_record,
+)
+
+
+def _igs_to_step(
+    igs_file_path: str,
+    save_step_file_path: str,
+    overwrite: bool,
+) -> bool:
+    return igs_to_step(igs_file_path, save_step_file_path, overwrite)
+
+
+class IGSConvertor(object):
+    def __init__(self) -> None:
+        return
+
+    def convertIGSFile(
+        self,
+        igs_file_path: str,
+        save_step_file_path: str,
+        overwrite: bool = False,
+    ) -> bool:
+        return igs_to_step(igs_file_path, save_step_file_path, overwrite)
+
+    def convertIGSFolder(
+        self,
+        igs_root_folder_path: str,
+        save_step_root_folder_path: str,
+        workers: int = 1,
+        overwrite: bool = False,
+        timeout: float = None,
+        manifest_file_path: str = None,
+    ) -> dict:
+        """
+        递归将文件夹下所有IGES文件转换为STEP文件，保持相对路径，每个文件在独立子进程中转换
+
+        Args:
+            igs_root_folder_path: IGES文件根目录
+            save_step_root_folder_path: STEP保存根目录
+            workers: 并行子进程数
+            overwrite: 是否覆盖已存在的STEP文件
+            timeout: 单个文件的最长转换时间（秒），None表示不限制
+            manifest_file_path: JSONL清单文件路径，不为None时记录每个文件的转换状态和耗时
+
+        Returns:
+            stats: 转换统计信息
+        """
+        stats = {
+            'file_num': 0,
+            'converted_num': 0,
+            'skipped_num': 0,
+            'failed_num': 0,
+            'spend_second': 0.0,
+            'files_per_second': 0.0,
+        }
+
+        if not os.path.exists(igs_root_folder_path):
+            print('[ERROR][IGSConvertor::convertIGSFolder]')
+            print('\t igs root folder not exist!')
+            print('\t igs_root_folder_path:', igs_root_folder_path)
+            return stats
+
+        rel_igs_file_path_list = find_files(igs_root_folder_path, ['.igs', '.iges'])
+        stats['file_num'] = len(rel_igs_file_path_list)
+
+        task_args_list = []
+        for rel_igs_file_path in rel_igs_file_path_list:
+            igs_file_path = os.path.join(igs_root_folder_path, rel_igs_file_path)
+            save_step_file_path = os.path.join(
+                save_step_root_folder_path,
+                os.path.splitext(rel_igs_file_path)[0] + '.step',
+            )
+
+            # 已存在的结果无需启动子进程，清单中记录为skipped，保证清单覆盖全部文件
+            if os.path.exists(save_step_file_path) and not overwrite:
+                stats['skipped_num'] += 1
+                if manifest_file_path is not None:
+                    append_manifest_record(manifest_file_path, {
+                        'path': igs_file_path,
+                        'save_path': save_step_file_path,
+                        'status': 'skipped',
+                        'duration': 0.0,
+                        'peak_rss': None,
+                    })
+                continue
+
+            task_args_list.append((igs_file_path, save_step_file_path, overwrite))
+
+        print('[INFO][IGSConvertor::convertIGSFolder]')
+        print('\t start convert', len(task_args_list), 'igs files with', workers, 'workers...')
+
+        start = time()
+        for task_idx, status, result, run_info in run_isolated_tasks(
+                _igs_to_step, task_args_list, workers, timeout):
+            igs_file_path, save_step_file_path, _ = task_args_list[task_idx]
+
+            if status == 'ok':
+                status = 'converted' if result else 'failed'
+
+            if status == 'converted':
+                stats['converted_num'] += 1
+            else:
+                stats['failed_num'] += 1
+                print('[ERROR][IGSConvertor::convertIGSFolder]')
+                print('\t convert failed! status:', status)
+                print('\t igs_file_path:', igs_file_path)
+
+            if manifest_file_path is not None:
+                append_manifest_record(manifest_file_path, {
+                    'path': igs_file_path,
+                    'save_path': save_step_file_path,
+                    'status': status,
+                    'duration': run_info['duration'],
+                    'peak_rss': run_info['peak_rss'],
+                })
+
+        spend = time() - start
+        stats['spend_second'] = spend
+        if spend > 0:
+            stats['files_per_second'] = len(task_args_list) / spend
+
+        print('[INFO][IGSConvertor::convertIGSFolder]')
+        print('\t converted:', stats['converted_num'], ', skipped:', stats['skipped_num'],
+              ', failed:', stats['failed_num'])
+        print('\t spend: %.2fs, %.2f files/s' % (spend, stats['files_per_second']))
+        return stats
@@ -1,35 +1,449 @@
 import os
-import pickle 
+import pickle
+from time import time
+from typing import Union
 
-from muv_convert.Method.path import createFileFolder, removeFile
+from muv_convert.Method.batch import (
+    find_files,
+    run_isolated_tasks,
+    append_manifest_record,
+)
+from muv_convert.Method.instrument import start_record, stop_record, record_stage, aggregate_records
+from muv_convert.Method.storage import BACKEND_EXT_DICT, save_shape_file
+from muv_convert.Method.cache import (
+    check_convert_cache,
+    create_key_info,
+    save_key_info,
+    remove_key_info,
+    remove_tmp_files,
+)
+from muv_convert.Method.path import createFileFolder, getTmpFilePath, removeFile, renameFile
 from muv_convert.Module.step_loader import StepLoader
 
+
+def _convert_step_file(
+    muv_convertor,
+    step_file_path: str,
+    save_pkl_file_path: str,
+    overwrite: bool,
+    incremental: bool,
+    key_info: Union[dict, None] = None,
+) -> dict:
+    muv_convertor.convertStepFile(step_file_path, save_pkl_file_path, overwrite, incremental, key_info)
+    return muv_convertor.convert_info
+
+
+def _create_convert_record(
+    step_file_path: str,
+    save_pkl_file_path: str,
+    status: str,
+    result,
+    run_info: dict,
+) -> dict:
+    """
+    将run_isolated_tasks的返回结果整理为一条清单记录
+    """
+    record = {
+        'path': step_file_path,
+        'save_path': save_pkl_file_path,
+        'status': status,
+        'duration': run_info['duration'],
+        'peak_rss': run_info['peak_rss'],
+        'shape_num': 0,
+        'face_num': 0,
+        'edge_num': 0,
+        'error': None,
+    }
+
+    if status == 'ok':
+        record.update(result)
+    elif status == 'crash':
+        record['error'] = 'exitcode: ' + str(result)
+    elif status == 'timeout':
+        record['error'] = 'timeout after %.1fs' % run_info['duration']
+    else:
+        record['error'] = result
+    return record
+
+
 class MUVConvertor(StepLoader):
-    def __init__(self) -> None:
-        StepLoader.__init__(self)
+    def __init__(
+        self,
+        split_closed: bool = True,
+        face_edge_list: bool = True,
+        face_num_u: int = 32,
+        face_num_v: int = 32,
+        edge_num_u: int = 32,
+        adaptive_sampling: bool = False,
+        solid_workers: int = 1,
+        max_face_num: Union[int, None] = None,
+        max_edge_num: Union[int, None] = None,
+        brep_cache_folder_path: Union[str, None] = None,
+        cache_split_closed: bool = False,
+        stream_save: bool = False,
+        instrument: bool = False,
+        compact: bool = False,
+        coord_dtype: str = 'float32',
+        storage_backend: str = 'pkl',
+        normalize: bool = False,
+    ) -> None:
+        StepLoader.__init__(
+            self,
+            split_closed,
+            face_edge_list,
+            face_num_u,
+            face_num_v,
+            edge_num_u,
+            adaptive_sampling,
+            solid_workers,
+            max_face_num,
+            max_edge_num,
+            brep_cache_folder_path,
+            cache_split_closed,
+            normalize,
+            compact,
+            coord_dtype,
+        )
+
+        # 是否逐个形状流式写入pkl，可用Method.pkl.load_pkl_file读取
+        self.stream_save = stream_save
+
+        # 保存格式，'pkl', 'npz' 或 'zstd'，见Method.storage，非pkl格式不支持流式写入
+        self.storage_backend = storage_backend
+
+        # 是否记录每个文件各阶段的耗时、面边数、采样失败数和峰值内存，结果保存在convert_info['profile']中
+        self.instrument = instrument
+
+        # 最近一次convertStepFile的结果统计
+        self.convert_info = {}
         return
 
+    def updateConvertInfo(self, cad_data: dict) -> bool:
+        self.convert_info['shape_num'] += 1
+        self.convert_info['face_num'] += cad_data['data']['face_mask' if self.compact else 'face_pnts'].shape[0]
+        self.convert_info['edge_num'] += cad_data['data']['edge_pnts'].shape[0]
+        return True
+
     def convertStepFile(
         self,
         step_file_path: str,
         save_pkl_file_path: str,
         overwrite: bool = False,
+        incremental: bool = False,
+        key_info: Union[dict, None] = None,
+    ) -> bool:
+        """
+        转换单个STEP文件，结果先写入临时文件再重命名，保证pkl文件存在即完整
+        后缀为.igs/.iges时按IGES文件读取
+
+        Args:
+            overwrite: 是否覆盖已存在的pkl文件，incremental为True时忽略
+            incremental: 增量模式，仅当STEP文件内容、转换器版本或转换参数变化时才重新转换
+            key_info: 调用方已检查过缓存失效时传入的缓存键信息，不为None时不再重复计算STEP文件哈希
+        """
+        self.convert_info = {
+            'status': 'skipped',
+            'shape_num': 0,
+            'face_num': 0,
+            'edge_num': 0,
+        }
+
+        if not self.instrument:
+            return self._convertStepFile(step_file_path, save_pkl_file_path, overwrite, incremental, key_info)
+
+        start_record()
+        try:
+            return self._convertStepFile(step_file_path, save_pkl_file_path, overwrite, incremental, key_info)
+        finally:
+            self.convert_info['profile'] = stop_record()
+
+    def _convertStepFile(
+        self,
+        step_file_path: str,
+        save_pkl_file_path: str,
+        overwrite: bool,
+        incremental: bool,
+        key_info: Union[dict, None] = None,
     ) -> bool:
-        if os.path.exists(save_pkl_file_path):
+        if incremental:
+            if not os.path.exists(step_file_path):
+                print('[ERROR][MUVConvertor::convertStepFile]')
+                print('\t step file not exist!')
+                print('\t step_file_path:', step_file_path)
+                self.convert_info['status'] = 'read_error'
+                return False
+
+            if key_info is None:
+                is_valid, key_info = check_convert_cache(
+                    step_file_path, save_pkl_file_path, self.getConvertParams())
+                if is_valid:
+                    return True
+
+            remove_key_info(save_pkl_file_path)
+
+            # 没有已有结果时在此计算哈希，由并行的子进程各自完成
+            if key_info is None:
+                key_info = create_key_info(step_file_path, self.getConvertParams())
+        elif os.path.exists(save_pkl_file_path):
             if not overwrite:
                 return True
 
             removeFile(save_pkl_file_path)
 
-        cad_data_list = self.loadStepFile(step_file_path)
+        shapes_list, is_split = self.loadCADShapesList(step_file_path)
 
-        if cad_data_list is None:
+        if shapes_list is None:
             print('[ERROR][MUVConvertor::convertStepFile]')
-            print('\t loadStepFile failed!')
+            print('\t loadCADShapesList failed!')
+            self.convert_info['status'] = 'read_error'
             return False
 
         createFileFolder(save_pkl_file_path)
 
+        tmp_pkl_file_path = getTmpFilePath(save_pkl_file_path)
+        if self.storage_backend != 'pkl':
+            cad_data_list = list(self.iterShapesList(shapes_list, is_split))
+            with record_stage('serialization'):
+                is_saved = save_shape_file(cad_data_list, tmp_pkl_file_path, self.storage_backend)
+            if not is_saved:
+                print('[ERROR][MUVConvertor::convertStepFile]')
+                print('\t save_shape_file failed!')
+                removeFile(tmp_pkl_file_path)
+                self.convert_info['status'] = 'write_error'
+                return False
+
+            for cad_data in cad_data_list:
+                self.updateConvertInfo(cad_data)
+        else:
+            self.savePklFile(shapes_list, is_split, tmp_pkl_file_path)
+
+        renameFile(tmp_pkl_file_path, save_pkl_file_path, overwrite=True)
+
+        if key_info is not None:
+            save_key_info(save_pkl_file_path, key_info)
+
+        self.convert_info['status'] = 'converted'
+        self.convert_info['skip_info_list'] = self.skip_info_list
+        return True
+
+    def savePklFile(self, shapes_list: list, is_split: bool, save_pkl_file_path: str) -> bool:
+        """
+        解析形状并以pickle格式写入，stream_save为True时逐个形状写入
+        """
         with open(save_pkl_file_path, "wb") as tf:
-            pickle.dump(cad_data_list, tf)
+            if self.stream_save:
+                for cad_data in self.iterShapesList(shapes_list, is_split):
+                    with record_stage('serialization'):
+                        pickle.dump(cad_data, tf)
+                    self.updateConvertInfo(cad_data)
+            else:
+                cad_data_list = list(self.iterShapesList(shapes_list, is_split))
+                with record_stage('serialization'):
+                    pickle.dump(cad_data_list, tf)
+                for cad_data in cad_data_list:
+                    self.updateConvertInfo(cad_data)
+        return True
+
+    def convertIGSFile(
+        self,
+        igs_file_path: str,
+        save_pkl_file_path: str,
+        overwrite: bool = False,
+        incremental: bool = False,
+    ) -> bool:
+        """
+        直接由IGES文件转换为pkl，不写入和重新读取中间STEP文件
+        """
+        return self.convertStepFile(igs_file_path, save_pkl_file_path, overwrite, incremental)
+
+    def convertStepFileGuarded(
+        self,
+        step_file_path: str,
+        save_pkl_file_path: str,
+        overwrite: bool = False,
+        timeout: float = None,
+        memory_limit: int = None,
+        manifest_file_path: str = None,
+        incremental: bool = False,
+    ) -> bool:
+        """
+        在独立子进程中执行convertStepFile，超时、内存超限或崩溃均不影响当前进程
+
+        Args:
+            timeout: 最长转换时间（秒），None表示不限制
+            memory_limit: 子进程虚拟内存上限（字节），None表示不限制
+            manifest_file_path: JSONL清单文件路径，不为None时追加本次转换记录
+            incremental: 增量模式，见convertStepFile
+
+        Returns:
+            bool: 是否转换成功或已存在
+        """
+        task_args_list = [(self, step_file_path, save_pkl_file_path, overwrite, incremental)]
+
+        record = None
+        for _, status, result, run_info in run_isolated_tasks(
+                _convert_step_file, task_args_list, 1, timeout, memory_limit):
+            record = _create_convert_record(step_file_path, save_pkl_file_path, status, result, run_info)
+
+        # 超时、崩溃等情况下子进程来不及清理临时文件
+        if record['status'] in ['timeout', 'crash', 'memory_error', 'error']:
+            remove_tmp_files(save_pkl_file_path)
+
+        self.convert_info = record
+
+        if manifest_file_path is not None:
+            append_manifest_record(manifest_file_path, record)
+
+        if record['status'] not in ['converted', 'skipped']:
+            print('[ERROR][MUVConvertor::convertStepFileGuarded]')
+            print('\t convert failed! status:', record['status'])
+            print('\t error:', record['error'])
+            print('\t step_file_path:', step_file_path)
+            return False
+
         return True
+
+    def convertDataset(
+        self,
+        step_root_folder_path: str,
+        save_pkl_root_folder_path: str,
+        workers: int = 1,
+        overwrite: bool = False,
+        timeout: float = None,
+        memory_limit: int = None,
+        manifest_file_path: str = None,
+        incremental: bool = False,
+        ext_list: list = ['.step', '.stp'],
+    ) -> dict:
+        """
+        递归转换文件夹下所有STEP文件，保持相对路径，每个文件在独立子进程中转换
+
+        Args:
+            step_root_folder_path: STEP文件根目录
+            save_pkl_root_folder_path: 保存根目录，文件后缀由storage_backend决定
+            workers: 并行子进程数
+            overwrite: 是否覆盖已存在的pkl文件
+            timeout: 单个文件的最长转换时间（秒），None表示不限制
+            memory_limit: 单个子进程的虚拟内存上限（字节），None表示不限制
+            manifest_file_path: JSONL清单文件路径，不为None时记录每个文件的转换状态、耗时、峰值内存和面边数
+            incremental: 增量模式，只转换新增或内容、参数有变化的STEP文件，可在中断后继续
+            ext_list: 需要转换的文件后缀，加入['.igs', '.iges']可直接转换IGES文件
+
+        Returns:
+            stats: 转换统计信息，包含各状态文件数、面数、边数及吞吐率
+        """
+        stats = {
+            'file_num': 0,
+            'converted_num': 0,
+            'skipped_num': 0,
+            'failed_num': 0,
+            'face_num': 0,
+            'edge_num': 0,
+            'status_num': {},
+            'spend_second': 0.0,
+            'files_per_second': 0.0,
+            'faces_per_second': 0.0,
+        }
+
+        if not os.path.exists(step_root_folder_path):
+            print('[ERROR][MUVConvertor::convertDataset]')
+            print('\t step root folder not exist!')
+            print('\t step_root_folder_path:', step_root_folder_path)
+            return stats
+
+        rel_step_file_path_list = find_files(step_root_folder_path, ext_list)
+        stats['file_num'] = len(rel_step_file_path_list)
+
+        task_args_list = []
+        for rel_step_file_path in rel_step_file_path_list:
+            step_file_path = os.path.join(step_root_folder_path, rel_step_file_path)
+            save_pkl_file_path = os.path.join(
+                save_pkl_root_folder_path,
+                os.path.splitext(rel_step_file_path)[0] + BACKEND_EXT_DICT[self.storage_backend],
+            )
+
+            # 已存在的结果无需启动子进程，清单中记录为skipped，保证清单覆盖全部文件
+            # 已计算的缓存键传给子进程，避免重复计算哈希
+            is_skipped = False
+            key_info = None
+            if incremental:
+                is_skipped, key_info = check_convert_cache(
+                    step_file_path, save_pkl_file_path, self.getConvertParams())
+            elif os.path.exists(save_pkl_file_path) and not overwrite:
+                is_skipped = True
+
+            if is_skipped:
+                stats['skipped_num'] += 1
+                stats['status_num']['skipped'] = stats['status_num'].get('skipped', 0) + 1
+                if manifest_file_path is not None:
+                    record = _create_convert_record(
+                        step_file_path, save_pkl_file_path, 'skipped', None, {'duration': 0.0, 'peak_rss': None})
+                    append_manifest_record(manifest_file_path, record)
+                continue
+
+            task_args_list.append((self, step_file_path, save_pkl_file_path, overwrite, incremental, key_info))
+
+        print('[INFO][MUVConvertor::convertDataset]')
+        print('\t start convert', len(task_args_list), 'step files with', workers, 'workers...')
+        print('\t skipped', stats['skipped_num'], 'existing pkl files')
+
+        start = time()
+        finished_num = 0
+        profile_list = []
+        for task_idx, status, result, run_info in run_isolated_tasks(
+                _convert_step_file, task_args_list, workers, timeout, memory_limit):
+            finished_num += 1
+            step_file_path, save_pkl_file_path = task_args_list[task_idx][1:3]
+
+            record = _create_convert_record(step_file_path, save_pkl_file_path, status, result, run_info)
+            if manifest_file_path is not None:
+                append_manifest_record(manifest_file_path, record)
+
+            # 超时、崩溃等情况下子进程来不及清理临时文件
+            if record['status'] in ['timeout', 'crash', 'memory_error', 'error']:
+                remove_tmp_files(save_pkl_file_path)
+
+            if record.get('profile') is not None:
+                profile_list.append(record['profile'])
+
+            record_status = record['status']
+            stats['status_num'][record_status] = stats['status_num'].get(record_status, 0) + 1
+            if record_status == 'converted':
+                stats['converted_num'] += 1
+                stats['face_num'] += record['face_num']
+                stats['edge_num'] += record['edge_num']
+            elif record_status == 'skipped':
+                stats['skipped_num'] += 1
+            else:
+                stats['failed_num'] += 1
+                print('[ERROR][MUVConvertor::convertDataset]')
+                print('\t convert failed! status:', record_status)
+                print('\t error:', record['error'])
+                print('\t step_file_path:', step_file_path)
+
+            if finished_num % 100 == 0:
+                spend = time() - start
+                print('[INFO][MUVConvertor::convertDataset]')
+                print('\t finished', finished_num, '/', len(task_args_list),
+                      ', %.2f files/s, %.2f faces/s' % (finished_num / spend, stats['face_num'] / spend))
+
+        spend = time() - start
+        stats['spend_second'] = spend
+        if spend > 0:
+            stats['files_per_second'] = len(task_args_list) / spend
+            stats['faces_per_second'] = stats['face_num'] / spend
+
+        if len(profile_list) > 0:
+            stats['profile_summary'] = aggregate_records(profile_list)
+
+        print('[INFO][MUVConvertor::convertDataset]')
+        print('\t converted:', stats['converted_num'], ', skipped:', stats['skipped_num'],
+              ', failed:', stats['failed_num'])
+        print('\t status:', stats['status_num'])
+        print('\t spend: %.2fs, %.2f files/s, %.2f faces/s' % (
+            spend, stats['files_per_second'], stats['faces_per_second']))
+        if 'profile_summary' in stats:
+            for stage_name, stage_summary in stats['profile_summary']['stages'].items():
+                print('\t %s: p50 %.4fs, p90 %.4fs, p99 %.4fs' % (
+                    stage_name, stage_summary['p50'], stage_summary['p90'], stage_summary['p99']))
+        return stats
@@ -0,0 +1,261 @@
+import os
+import json
+import numpy as np
+from typing import Union
+from collections import OrderedDict
+
+from muv_convert.Method.batch import find_files
+from muv_convert.Method.schema import get_compact_key_list, expand_shape_data
+from muv_convert.Method.storage import BACKEND_EXT_DICT, load_shape_file
+from muv_convert.Module.shard_reader import ShardReader, is_shard_folder
+
+
+# 索引文件格式版本
+INDEX_VERSION = 1
+
+
+def get_data_bytes(shape_data_list: list) -> int:
+    return sum(
+        value.nbytes
+        for shape_data in shape_data_list
+        for value in shape_data['data'].values()
+        if isinstance(value, np.ndarray)
+    )
+
+
+class MUVDataset(object):
+    """
+    按形状索引转换结果目录，可直接作为torch.utils.data.Dataset使用
+        - 目录下的pkl/npz/muvz文件和ShardWriter打包的文件夹都会被索引
+        - 索引保存为json，之后只需读取索引，数据在访问时才读取
+        - 文件格式的数据按文件缓存，缓存总大小不超过cache_bytes，超出时淘汰最久未使用的文件
+        - 打包文件夹以np.memmap只读打开，多个dataloader worker共享系统页缓存，不会各自复制一份
+        - 紧凑格式的数据在返回前由expand_shape_data还原，缓存中保存的是紧凑格式
+    """
+    def __init__(
+        self,
+        data_root_folder_path: str,
+        index_file_path: Union[str, None] = None,
+        key_list: Union[list, None] = None,
+        cache_bytes: int = 1024 * 1024 * 1024,
+        rebuild_index: bool = False,
+    ) -> None:
+        """
+        Args:
+            data_root_folder_path: 转换结果根目录
+            index_file_path: 索引文件路径，None表示保存在根目录下的muv_index.json
+            key_list: 只读取指定的数组，None表示全部，键名为还原后的格式，如face_pnts
+            cache_bytes: 文件缓存的最大字节数，0表示不缓存
+            rebuild_index: 是否忽略已有索引重新扫描目录
+        """
+        self.data_root_folder_path = data_root_folder_path
+        self.index_file_path = index_file_path
+        if self.index_file_path is None:
+            self.index_file_path = os.path.join(data_root_folder_path, 'muv_index.json')
+
+        self.key_list = key_list
+        # 紧凑格式中还原key_list需要读取的数组
+        self.load_key_list = None if key_list is None else get_compact_key_list(key_list)
+        self.cache_bytes = cache_bytes
+
+        self.source_list = []
+        self.item_list = []
+
+        self.resetCache()
+
+        if not rebuild_index and self.loadIndex():
+            return
+
+        self.buildIndex()
+        self.saveIndex()
+        return
+
+    def resetCache(self) -> bool:
+        # 进程相关的状态，每个dataloader worker在首次访问时重新创建
+        self.pid = os.getpid()
+        self.cache = OrderedDict()
+        self.cache_size = 0
+        self.shard_reader_dict = {}
+        return True
+
+    def __getstate__(self) -> dict:
+        # 以spawn方式启动worker时不复制缓存和memmap
+        state = self.__dict__.copy()
+        state['cache'] = OrderedDict()
+        state['cache_size'] = 0
+        state['shard_reader_dict'] = {}
+        return state
+
+    def loadIndex(self) -> bool:
+        if not os.path.exists(self.index_file_path):
+            return False
+
+        with open(self.index_file_path, 'r') as f:
+            index = json.load(f)
+
+        if index.get('version') != INDEX_VERSION:
+            return False
+
+        self.source_list = index['sources']
+        self.item_list = index['items']
+        return True
+
+    def saveIndex(self) -> bool:
+        index = {
+            'version': INDEX_VERSION,
+            'sources': self.source_list,
+            'items': self.item_list,
+        }
+
+        index_folder_path = os.path.dirname(self.index_file_path)
+        if index_folder_path != '':
+            os.makedirs(index_folder_path, exist_ok=True)
+
+        tmp_index_file_path = self.index_file_path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp_index_file_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_index_file_path, self.index_file_path)
+        return True
+
+    def buildIndex(self) -> bool:
+        """
+        扫描根目录，记录每个形状所在的文件或打包文件夹、序号、类型和面数、边数
+
+        Returns:
+            items: [source_idx, shape_idx, type, face_num, edge_num]
+        """
+        self.source_list = []
+        self.item_list = []
+
+        if not os.path.exists(self.data_root_folder_path):
+            print('[ERROR][MUVDataset::buildIndex]')
+            print('\t data root folder not exist!')
+            print('\t data_root_folder_path:', self.data_root_folder_path)
+            return False
+
+        for rel_meta_file_path in find_files(self.data_root_folder_path, ['.json']):
+            if os.path.basename(rel_meta_file_path) != 'meta.json':
+                continue
+
+            rel_shard_folder_path = os.path.dirname(rel_meta_file_path)
+            shard_folder_path = os.path.join(self.data_root_folder_path, rel_shard_folder_path)
+            # BREP缓存等其他目录下的meta.json不是打包格式
+            if not is_shard_folder(shard_folder_path):
+                continue
+
+            shard_reader = ShardReader(shard_folder_path)
+            if shard_reader.meta is None:
+                continue
+
+            source_idx = len(self.source_list)
+            self.source_list.append({'type': 'shard', 'path': rel_shard_folder_path})
+
+            face_nums = np.diff(shard_reader.offsets_dict['faceEdge_indptr']) - 1
+            edge_nums = np.diff(shard_reader.offsets_dict['edgeFace_adj'])
+            for i in range(len(shard_reader)):
+                self.item_list.append([
+                    source_idx, i, shard_reader.meta['types'][i], int(face_nums[i]), int(edge_nums[i])])
+
+        for rel_file_path in find_files(self.data_root_folder_path, list(BACKEND_EXT_DICT.values())):
+            shape_data_list = load_shape_file(
+                os.path.join(self.data_root_folder_path, rel_file_path),
+                key_list=['faceEdge_indptr', 'edgeFace_adj'],
+            )
+            if shape_data_list is None:
+                continue
+
+            source_idx = len(self.source_list)
+            self.source_list.append({'type': 'file', 'path': rel_file_path})
+
+            for i, shape_data in enumerate(shape_data_list):
+                data = shape_data['data']
+                self.item_list.append([
+                    source_idx, i, shape_data['type'],
+                    int(data['faceEdge_indptr'].shape[0] - 1), int(data['edgeFace_adj'].shape[0])])
+
+        print('[INFO][MUVDataset::buildIndex]')
+        print('\t indexed', len(self.item_list), 'shapes in', len(self.source_list), 'sources')
+        return True
+
+    def __len__(self) -> int:
+        return len(self.item_list)
+
+    def getShapeInfo(self, idx: int) -> dict:
+        source_idx, shape_idx, shape_type, face_num, edge_num = self.item_list[idx]
+        return {
+            'source': self.source_list[source_idx]['path'],
+            'idx': shape_idx,
+            'type': shape_type,
+            'face_num': face_num,
+            'edge_num': edge_num,
+        }
+
+    def getShardReader(self, rel_shard_folder_path: str) -> ShardReader:
+        if rel_shard_folder_path not in self.shard_reader_dict:
+            self.shard_reader_dict[rel_shard_folder_path] = ShardReader(
+                os.path.join(self.data_root_folder_path, rel_shard_folder_path))
+        return self.shard_reader_dict[rel_shard_folder_path]
+
+    def loadFileData(self, rel_file_path: str) -> Union[list, None]:
+        if rel_file_path in self.cache:
+            self.cache.move_to_end(rel_file_path)
+            return self.cache[rel_file_path]
+
+        shape_data_list = load_shape_file(
+            os.path.join(self.data_root_folder_path, rel_file_path),
+            key_list=self.load_key_list,
+        )
+        if shape_data_list is None:
+            return None
+
+        data_bytes = get_data_bytes(shape_data_list)
+        if data_bytes > self.cache_bytes:
+            return shape_data_list
+
+        self.cache[rel_file_path] = shape_data_list
+        self.cache_size += data_bytes
+        while self.cache_size > self.cache_bytes:
+            _, evict_shape_data_list = self.cache.popitem(last=False)
+            self.cache_size -= get_data_bytes(evict_shape_data_list)
+        return shape_data_list
+
+    def getShapeData(self, idx: int) -> Union[dict, None]:
+        """
+        Returns:
+            shape_data: {'type', 'data'}，打包文件夹中非紧凑格式的数组为memmap视图
+        """
+        if idx < 0 or idx >= len(self):
+            print('[ERROR][MUVDataset::getShapeData]')
+            print('\t idx out of range!')
+            print('\t idx:', idx, ', shape_num:', len(self))
+            return None
+
+        # fork出的worker不复用父进程打开的文件和缓存
+        if os.getpid() != self.pid:
+            self.resetCache()
+
+        source_idx, shape_idx, shape_type, _, _ = self.item_list[idx]
+        source = self.source_list[source_idx]
+
+        if source['type'] == 'shard':
+            shape_data = self.getShardReader(source['path']).getShapeData(shape_idx, self.load_key_list)
+            if shape_data is None:
+                return None
+            data = shape_data['data']
+        else:
+            shape_data_list = self.loadFileData(source['path'])
+            if shape_data_list is None:
+                return None
+            data = shape_data_list[shape_idx]['data']
+
+        data = expand_shape_data(data)
+        if self.key_list is not None:
+            data = {key: data[key] for key in self.key_list if key in data}
+
+        return {
+            'type': shape_type,
+            'data': data,
+        }
+
+    def __getitem__(self, idx: int) -> Union[dict, None]:
+        return self.getShapeData(idx)
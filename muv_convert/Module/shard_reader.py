@@ -0,0 +1,116 @@
+import os
+import json
+import numpy as np
+from typing import Union
+
+
+def is_shard_meta(meta) -> bool:
+    """
+    meta.json是否为ShardWriter写入的打包格式，BREP缓存等其他目录下的meta.json返回False
+    """
+    return isinstance(meta, dict) and 'shape_num' in meta and 'types' in meta and 'arrays' in meta
+
+
+def is_shard_folder(shard_folder_path: str) -> bool:
+    meta_file_path = os.path.join(shard_folder_path, 'meta.json')
+    if not os.path.exists(meta_file_path):
+        return False
+
+    try:
+        with open(meta_file_path, 'r') as f:
+            return is_shard_meta(json.load(f))
+    except Exception:
+        return False
+
+
+class ShardReader(object):
+    """
+    以np.memmap打开ShardWriter写入的打包文件夹，O(1)零拷贝访问第i个形状
+    """
+    def __init__(self, shard_folder_path: str) -> None:
+        self.shard_folder_path = shard_folder_path
+
+        self.meta = None
+        self.array_dict = {}
+        self.offsets_dict = {}
+
+        self.loadShard(shard_folder_path)
+        return
+
+    def loadShard(self, shard_folder_path: str) -> bool:
+        meta_file_path = os.path.join(shard_folder_path, 'meta.json')
+        if not os.path.exists(meta_file_path):
+            print('[ERROR][ShardReader::loadShard]')
+            print('\t shard meta file not exist!')
+            print('\t meta_file_path:', meta_file_path)
+            return False
+
+        with open(meta_file_path, 'r') as f:
+            meta = json.load(f)
+
+        if not is_shard_meta(meta):
+            print('[ERROR][ShardReader::loadShard]')
+            print('\t meta file is not a shard meta!')
+            print('\t meta_file_path:', meta_file_path)
+            return False
+
+        self.meta = meta
+        self.shard_folder_path = shard_folder_path
+        self.array_dict = {}
+        self.offsets_dict = {}
+        for key, array_info in self.meta['arrays'].items():
+            dtype = np.dtype(array_info['dtype'])
+            shape = tuple([array_info['length']] + array_info['item_shape'])
+
+            # 空文件无法memmap
+            if array_info['length'] == 0:
+                self.array_dict[key] = np.zeros(shape, dtype=dtype)
+            else:
+                self.array_dict[key] = np.memmap(
+                    os.path.join(shard_folder_path, key + '.bin'),
+                    dtype=dtype,
+                    mode='r',
+                    shape=shape,
+                )
+
+            self.offsets_dict[key] = np.load(os.path.join(shard_folder_path, key + '.offsets.npy'))
+        return True
+
+    def __len__(self) -> int:
+        if self.meta is None:
+            return 0
+        return self.meta['shape_num']
+
+    def getShapeData(self, idx: int, key_list: Union[list, None] = None) -> Union[dict, None]:
+        """
+        Args:
+            idx: 形状序号
+            key_list: 只返回指定的数组，None表示全部，不存在的数组会被忽略
+
+        Returns:
+            shape_data: {'type', 'data'}，data中的数组均为memmap视图，不会读入内存
+                data中同时包含meta.json记录的标量字段，紧凑格式可直接由expand_shape_data还原
+        """
+        if idx < 0 or idx >= len(self):
+            print('[ERROR][ShardReader::getShapeData]')
+            print('\t idx out of range!')
+            print('\t idx:', idx, ', shape_num:', len(self))
+            return None
+
+        if key_list is None:
+            key_list = list(self.array_dict.keys())
+
+        data = dict(self.meta.get('fields', {}))
+        for key in key_list:
+            if key not in self.array_dict:
+                continue
+            offsets = self.offsets_dict[key]
+            data[key] = self.array_dict[key][offsets[idx]:offsets[idx + 1]]
+
+        return {
+            'type': self.meta['types'][idx],
+            'data': data,
+        }
+
+    def __getitem__(self, idx: int) -> Union[dict, None]:
+        return self.getShapeData(idx)
@@ -0,0 +1,191 @@
+import os
+import json
+import numpy as np
+from typing import Union
+
+from muv_convert.Method.pkl import iter_pkl_file
+from muv_convert.Method.schema import get_array_dtype
+from muv_convert.Method.path import renameFolder, removeFolder
+
+
+# 打包格式版本
+SHARD_VERSION = 1
+
+
+class ShardWriter(object):
+    """
+    将多个形状的数组沿第0维拼接写入扁平二进制文件，并记录每个形状的偏移
+    文件夹结构:
+        meta.json: 形状数、类型列表、每个形状的来源文件和序号、每个数组的dtype、单元素形状，
+                   以及所有形状共有的标量字段，如紧凑格式的schema_version和coord_dtype
+        {key}.bin: 所有形状的{key}数组按顺序拼接的原始数据
+        {key}.offsets.npy: (shape_num+1,) 每个形状在{key}.bin中的起止行号
+    写入过程中的数据保存在临时目录，close时才替换shard_folder_path，打包失败不会破坏已有的打包文件夹
+    """
+    def __init__(self, shard_folder_path: str, overwrite: bool = False) -> None:
+        """
+        Args:
+            overwrite: 是否允许替换已有的打包文件夹，为False时仍会在close时替换，但会先给出警告
+        """
+        self.shard_folder_path = shard_folder_path
+        self.tmp_shard_folder_path = shard_folder_path + '.' + str(os.getpid()) + '.tmp'
+
+        self.type_list = []
+        self.source_list = []
+        self.failed_num = 0
+        self.field_dict = None
+        self.array_info_dict = None
+        self.file_dict = {}
+        self.offsets_dict = {}
+
+        if not overwrite and os.path.exists(os.path.join(shard_folder_path, 'meta.json')):
+            print('[WARN][ShardWriter::__init__]')
+            print('\t shard folder already exist! it will be replaced on close')
+            print('\t shard_folder_path:', shard_folder_path)
+
+        removeFolder(self.tmp_shard_folder_path)
+        os.makedirs(self.tmp_shard_folder_path, exist_ok=True)
+        return
+
+    def __del__(self) -> None:
+        for f in self.file_dict.values():
+            if not f.closed:
+                f.close()
+        return
+
+    def getArrayFilePath(self, key: str) -> str:
+        return os.path.join(self.tmp_shard_folder_path, key + '.bin')
+
+    def getOffsetsFilePath(self, key: str) -> str:
+        return os.path.join(self.tmp_shard_folder_path, key + '.offsets.npy')
+
+    def __len__(self) -> int:
+        return len(self.type_list)
+
+    def addShapeData(self, shape_data: dict, source: Union[list, None] = None) -> bool:
+        """
+        Args:
+            shape_data: 包含'type'和'data'的字典，data中的所有np.ndarray都会被打包
+            source: [来源文件路径, 文件中的形状序号]，None表示未知
+
+        Returns:
+            bool: 是否写入，与打包格式不匹配的形状不会写入并计入failed_num
+        """
+        data = shape_data['data']
+
+        # 标量字段保存在meta.json中，读取时恢复，紧凑格式依赖这些字段还原坐标
+        field_dict = {key: value for key, value in data.items() if isinstance(value, (str, int, float, bool))}
+        if self.field_dict is None:
+            self.field_dict = field_dict
+        elif field_dict != self.field_dict:
+            print('[ERROR][ShardWriter::addShapeData]')
+            print('\t fields not match the shard format!')
+            print('\t fields:', field_dict, ', shard fields:', self.field_dict, ', source:', source)
+            self.failed_num += 1
+            return False
+
+        if self.array_info_dict is None:
+            self.array_info_dict = {}
+            for key, value in data.items():
+                if not isinstance(value, np.ndarray):
+                    continue
+                # 按键名确定类型，避免由第一个形状的空数组决定整个打包文件的类型
+                dtype = get_array_dtype(key, data.get('coord_dtype'))
+                if dtype is None:
+                    dtype = value.dtype
+                self.array_info_dict[key] = {
+                    'dtype': dtype.str,
+                    'item_shape': list(value.shape[1:]),
+                }
+                self.file_dict[key] = open(self.getArrayFilePath(key), 'wb')
+                self.offsets_dict[key] = [0]
+
+        # 先检查所有数组，避免写入一半导致偏移不一致
+        array_dict = {}
+        for key, array_info in self.array_info_dict.items():
+            value = data.get(key)
+            if not isinstance(value, np.ndarray) or value.ndim == 0 or \
+                    list(value.shape[1:]) != array_info['item_shape']:
+                print('[ERROR][ShardWriter::addShapeData]')
+                print('\t array not match the shard format!')
+                print('\t key:', key, ', source:', source)
+                self.failed_num += 1
+                return False
+            array_dict[key] = np.ascontiguousarray(value, dtype=np.dtype(array_info['dtype']))
+
+        for key, array in array_dict.items():
+            self.file_dict[key].write(array.tobytes())
+            self.offsets_dict[key].append(self.offsets_dict[key][-1] + array.shape[0])
+
+        self.type_list.append(shape_data['type'])
+        self.source_list.append(source)
+        return True
+
+    def addShapeDataList(self, shape_data_list: list, source_file_path: Union[str, None] = None) -> bool:
+        """
+        Returns:
+            bool: 是否全部写入
+        """
+        failed_num = 0
+        for i, shape_data in enumerate(shape_data_list):
+            source = None if source_file_path is None else [source_file_path, i]
+            if not self.addShapeData(shape_data, source):
+                failed_num += 1
+
+        if failed_num > 0:
+            print('[ERROR][ShardWriter::addShapeDataList]')
+            print('\t', failed_num, '/', len(shape_data_list), 'shapes not match the shard format!')
+            print('\t source_file_path:', source_file_path)
+            return False
+        return True
+
+    def addPklFile(self, pkl_file_path: str) -> bool:
+        """
+        Returns:
+            bool: 文件中的形状是否全部写入
+        """
+        if not os.path.exists(pkl_file_path):
+            print('[ERROR][ShardWriter::addPklFile]')
+            print('\t pkl file not exist!')
+            print('\t pkl_file_path:', pkl_file_path)
+            return False
+
+        shape_num = 0
+        failed_num = 0
+        for i, shape_data in enumerate(iter_pkl_file(pkl_file_path)):
+            shape_num += 1
+            if not self.addShapeData(shape_data, [pkl_file_path, i]):
+                failed_num += 1
+
+        if failed_num > 0:
+            print('[ERROR][ShardWriter::addPklFile]')
+            print('\t', failed_num, '/', shape_num, 'shapes not match the shard format!')
+            print('\t pkl_file_path:', pkl_file_path)
+            return False
+        return True
+
+    def close(self) -> bool:
+        if self.array_info_dict is None:
+            self.array_info_dict = {}
+
+        for key, f in self.file_dict.items():
+            f.close()
+            offsets = np.array(self.offsets_dict[key], dtype=np.int64)
+            np.save(self.getOffsetsFilePath(key), offsets)
+            self.array_info_dict[key]['length'] = int(offsets[-1])
+
+        meta = {
+            'version': SHARD_VERSION,
+            'shape_num': len(self.type_list),
+            'types': self.type_list,
+            'sources': self.source_list,
+            'failed_num': self.failed_num,
+            'fields': {} if self.field_dict is None else self.field_dict,
+            'arrays': self.array_info_dict,
+        }
+
+        with open(os.path.join(self.tmp_shard_folder_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        renameFolder(self.tmp_shard_folder_path, self.shard_folder_path, overwrite=True)
+        return True
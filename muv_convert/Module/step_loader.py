@@ -1,34 +1,375 @@
 import os
+import json
 from typing import Union
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 
-from muv_convert.Method.io import load_step_file, extract_all_shapes, parse_shape
-from muv_convert.Method.render import vis_faces_edges, vis_faces_edges_list
+from muv_convert.Method.cache import hash_file
+from muv_convert.Method.schema import expand_shape_data
+from muv_convert.Method.brep import shape_to_brep_string, write_bin_brep_file, read_bin_brep_file
+from muv_convert.Method.path import renameFolder, removeFolder
+from muv_convert.Method.convert import load_igs_file
+from muv_convert.Method.convert_utils import split_closed_shape
+from muv_convert.Method.io import (
+    load_step_file,
+    extract_all_shapes,
+    count_faces_edges,
+    filter_shapes,
+    create_occwl_shape,
+    parse_shape,
+    parse_brep_shape,
+)
 
 
 class StepLoader(object):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        split_closed: bool = True,
+        face_edge_list: bool = True,
+        face_num_u: int = 32,
+        face_num_v: int = 32,
+        edge_num_u: int = 32,
+        adaptive_sampling: bool = False,
+        solid_workers: int = 1,
+        max_face_num: Union[int, None] = None,
+        max_edge_num: Union[int, None] = None,
+        brep_cache_folder_path: Union[str, None] = None,
+        cache_split_closed: bool = False,
+        normalize: bool = False,
+        compact: bool = False,
+        coord_dtype: str = 'float32',
+    ) -> None:
+        self.split_closed = split_closed
+        self.face_edge_list = face_edge_list
+        self.face_num_u = face_num_u
+        self.face_num_v = face_num_v
+        self.edge_num_u = edge_num_u
+        # 只影响面采样，边采样中的直线、圆、椭圆已由解析式计算
+        self.adaptive_sampling = adaptive_sampling
+
+        # 额外输出包围盒和归一化局部坐标，训练时无需再逐个形状归一化
+        self.normalize = normalize
+
+        # 输出紧凑格式，coord_dtype为'float16'或'uint16'时进一步压缩坐标，见Method.schema
+        self.compact = compact
+        self.coord_dtype = coord_dtype
+
+        # 单个STEP文件内多个形状的并行解析进程数，不影响解析结果
+        self.solid_workers = solid_workers
+
+        # 采样前剔除面数、边数过多的形状，None表示不限制，参考Config.constant.MAX_FACE
+        self.max_face_num = max_face_num
+        self.max_edge_num = max_edge_num
+
+        # 二进制BREP缓存目录，None表示不使用缓存
+        # cache_split_closed为True时缓存分割闭合面之后的形状，再次解析时跳过分割
+        # 只分割通过筛选的形状，被剔除的形状以未分割的状态缓存，之后筛选条件放宽时再分割并更新缓存
+        self.brep_cache_folder_path = brep_cache_folder_path
+        self.cache_split_closed = cache_split_closed
+
+        # 最近一次解析中被跳过的形状及原因
+        self.skip_info_list = []
         return
 
-    def loadStepFile(self, step_file_path: str) -> Union[list, None]:
+    def getParseParams(self) -> dict:
+        return {
+            'split_closed': self.split_closed,
+            'face_edge_list': self.face_edge_list,
+            'face_num_u': self.face_num_u,
+            'face_num_v': self.face_num_v,
+            'edge_num_u': self.edge_num_u,
+            'adaptive_sampling': self.adaptive_sampling,
+            'normalize': self.normalize,
+            'compact': self.compact,
+            'coord_dtype': self.coord_dtype,
+        }
+
+    def getFilterParams(self) -> dict:
+        return {
+            'max_face_num': self.max_face_num,
+            'max_edge_num': self.max_edge_num,
+        }
+
+    def getConvertParams(self) -> dict:
+        """
+        所有影响转换结果的参数
+        """
+        convert_params = self.getParseParams()
+        convert_params.update(self.getFilterParams())
+
+        # 不使用归一化和紧凑格式时保持与旧版本相同的缓存键，避免已有结果全部重新转换
+        if not self.normalize:
+            convert_params.pop('normalize')
+        if not self.compact:
+            convert_params.pop('compact')
+            convert_params.pop('coord_dtype')
+        return convert_params
+
+    def loadStepShape(self, step_file_path: str):
+        """
+        读取STEP文件，返回顶层TopoDS_Shape，失败时返回None
+        """
         if not os.path.exists(step_file_path):
-            print('[ERROR][StepLoader::loadStepFile]')
+            print('[ERROR][StepLoader::loadStepShape]')
             print('\t step file not exist!')
             print('\t step_file_path:', step_file_path)
             return None
 
         shape = load_step_file(step_file_path)
+        if shape is None:
+            print('[ERROR][StepLoader::loadStepShape]')
+            print('\t load_step_file failed!')
+            print('\t step_file_path:', step_file_path)
+            return None
+
+        return shape
+
+    def loadIGSShape(self, igs_file_path: str):
+        """
+        读取IGES文件，返回顶层TopoDS_Shape，失败时返回None
+        """
+        if not os.path.exists(igs_file_path):
+            print('[ERROR][StepLoader::loadIGSShape]')
+            print('\t igs file not exist!')
+            print('\t igs_file_path:', igs_file_path)
+            return None
 
-        shapes_list = extract_all_shapes(shape)
+        shape = load_igs_file(igs_file_path)
+        if shape is None:
+            print('[ERROR][StepLoader::loadIGSShape]')
+            print('\t load_igs_file failed!')
+            print('\t igs_file_path:', igs_file_path)
+            return None
+
+        return shape
+
+    def loadCADShape(self, cad_file_path: str):
+        """
+        按后缀读取STEP或IGES文件，IGES文件直接解析，无需先转换为STEP
+        """
+        if os.path.splitext(cad_file_path)[1].lower() in ['.igs', '.iges']:
+            return self.loadIGSShape(cad_file_path)
+
+        return self.loadStepShape(cad_file_path)
+
+    def filterShapesList(self, shapes_list: list, size_list: Union[list, None] = None) -> list:
+        self.skip_info_list = []
+        shapes_list = filter_shapes(
+            shapes_list,
+            skip_info_list=self.skip_info_list,
+            size_list=size_list,
+            **self.getFilterParams(),
+        )
+
+        for skip_info in self.skip_info_list:
+            print('[WARN][StepLoader::filterShapesList]')
+            print('\t skip shape', skip_info['shape_idx'], '(' + skip_info['type'] + '):', skip_info['reason'])
+        return shapes_list
+
+    def getBrepCacheFolderPath(self, cad_file_path: str) -> str:
+        cache_name = hash_file(cad_file_path)
+        if self.cache_split_closed and self.split_closed:
+            cache_name += '_split'
+        return os.path.join(self.brep_cache_folder_path, cache_name[:2], cache_name)
+
+    def loadBrepCache(self, cache_folder_path: str) -> Union[tuple, None]:
+        """
+        Returns:
+            (shapes_list, size_list, split_list)，缓存不存在或损坏时返回None
+                split_list: 每个形状是否已分割闭合面
+        """
+        meta_file_path = os.path.join(cache_folder_path, 'meta.json')
+        if not os.path.exists(meta_file_path):
+            return None
+
+        try:
+            with open(meta_file_path, 'r') as f:
+                meta = json.load(f)
+
+            shapes_list = []
+            size_list = []
+            split_list = []
+            for i, shape_info in enumerate(meta['shapes']):
+                shape = read_bin_brep_file(os.path.join(cache_folder_path, str(i) + '.bin'))
+                if shape is None:
+                    return None
+
+                shapes_list.append((shape_info['type'], create_occwl_shape(shape_info['type'], shape)))
+                size_list.append((shape_info['face_num'], shape_info['edge_num']))
+                split_list.append(shape_info.get('split_closed', meta.get('split_closed', False)))
+        except Exception as e:
+            print('[WARN][StepLoader::loadBrepCache]')
+            print('\t load brep cache failed:', e)
+            return None
+
+        return shapes_list, size_list, split_list
+
+    def saveBrepCache(
+        self,
+        cache_folder_path: str,
+        shapes_list: list,
+        size_list: list,
+        split_list: list,
+    ) -> bool:
+        # 先写入临时目录再重命名，避免留下不完整的缓存
+        tmp_cache_folder_path = cache_folder_path + '.' + str(os.getpid()) + '.tmp'
+        os.makedirs(tmp_cache_folder_path, exist_ok=True)
+
+        meta = {
+            'shapes': [],
+        }
+        for i, ((shape_type, shape_obj), (face_num, edge_num), is_split) in enumerate(
+                zip(shapes_list, size_list, split_list)):
+            brep_file_path = os.path.join(tmp_cache_folder_path, str(i) + '.bin')
+            if not write_bin_brep_file(shape_obj.topods_shape(), brep_file_path):
+                print('[WARN][StepLoader::saveBrepCache]')
+                print('\t write_bin_brep_file failed!')
+                removeFolder(tmp_cache_folder_path)
+                return False
+
+            meta['shapes'].append({
+                'type': shape_type,
+                'face_num': face_num,
+                'edge_num': edge_num,
+                'split_closed': is_split,
+            })
+
+        with open(os.path.join(tmp_cache_folder_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        renameFolder(tmp_cache_folder_path, cache_folder_path, overwrite=True)
+        return True
+
+    def loadCADShapesList(self, cad_file_path: str) -> tuple:
+        """
+        读取STEP/IGES文件并提取、筛选所有形状，设置brep_cache_folder_path时优先从二进制BREP缓存读取
+
+        Returns:
+            (shapes_list, is_split): 形状列表及其是否已分割闭合面，读取失败时shapes_list为None
+        """
+        if self.brep_cache_folder_path is None:
+            shape = self.loadCADShape(cad_file_path)
+            if shape is None:
+                return None, False
+
+            shapes_list = extract_all_shapes(shape)
+            return self.filterShapesList(shapes_list), False
+
+        if not os.path.exists(cad_file_path):
+            print('[ERROR][StepLoader::loadCADShapesList]')
+            print('\t cad file not exist!')
+            print('\t cad_file_path:', cad_file_path)
+            return None, False
+
+        cache_folder_path = self.getBrepCacheFolderPath(cad_file_path)
+
+        cache = self.loadBrepCache(cache_folder_path)
+        if cache is not None:
+            shapes_list, size_list, split_list = cache
+        else:
+            shape = self.loadCADShape(cad_file_path)
+            if shape is None:
+                return None, False
+
+            shapes_list = extract_all_shapes(shape)
+            # 面数、边数在分割闭合面之前统计，与不使用缓存时的筛选结果一致
+            size_list = [count_faces_edges(shape_obj.topods_shape()) for _, shape_obj in shapes_list]
+            split_list = [False] * len(shapes_list)
+
+        # 先按面数、边数筛选，只对保留的形状分割闭合面
+        self.filterShapesList(shapes_list, size_list)
+        skip_idx_set = set(skip_info['shape_idx'] for skip_info in self.skip_info_list)
+        valid_idx_list = [i for i in range(len(shapes_list)) if i not in skip_idx_set]
+
+        is_split = self.cache_split_closed and self.split_closed
+        split_idx_list = []
+        if is_split:
+            split_idx_list = [i for i in valid_idx_list if not split_list[i]]
+            for i in split_idx_list:
+                shape_type, shape_obj = shapes_list[i]
+                shapes_list[i] = (shape_type, split_closed_shape(shape_obj))
+                split_list[i] = True
+
+        if cache is None or len(split_idx_list) > 0:
+            self.saveBrepCache(cache_folder_path, shapes_list, size_list, split_list)
+
+        return [shapes_list[i] for i in valid_idx_list], is_split
+
+    def iterShapesList(self, shapes_list: list, is_split: bool = False):
+        """
+        逐个解析形状，每解析完一个立即返回，峰值内存只取决于单个形状的采样数据
+
+        Args:
+            shapes_list: (shape_type, shape_obj)列表
+            is_split: 形状是否已分割闭合面，为True时不再重复分割
+
+        Yields:
+            shape_data: {'type': shape_type, 'data': data}
+        """
+        parse_params = self.getParseParams()
+        if is_split:
+            parse_params['split_closed'] = False
+
+        if self.solid_workers > 1 and len(shapes_list) > 1:
+            yield from self.iterShapesListParallel(shapes_list, parse_params)
+            return
 
-        shape_data_list = []
         for shape_type, shape_obj in shapes_list:
-            data = parse_shape(shape_obj, split_closed=True)
-            shape_data_list.append({
+            data = parse_shape(shape_obj, **parse_params)
+            yield {
                 'type': shape_type,
                 'data': data
-            })
+            }
+
+    def iterShapesListParallel(self, shapes_list: list, parse_params: dict):
+        """
+        将形状序列化为BREP文本后分发到进程池中解析，按原顺序返回结果
+        """
+        shape_type_list = [shape_type for shape_type, _ in shapes_list]
+        brep_str_list = [shape_to_brep_string(shape_obj.topods_shape()) for _, shape_obj in shapes_list]
+
+        workers = min(self.solid_workers, len(shapes_list))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            data_iter = executor.map(
+                parse_brep_shape,
+                shape_type_list,
+                brep_str_list,
+                repeat(parse_params),
+            )
+            for shape_type, data in zip(shape_type_list, data_iter):
+                yield {
+                    'type': shape_type,
+                    'data': data
+                }
+
+    def iterShape(self, shape):
+        """
+        逐个解析顶层shape中的Solid/Shell/Compound
+
+        Yields:
+            shape_data: {'type': shape_type, 'data': data}
+        """
+        shapes_list = self.filterShapesList(extract_all_shapes(shape))
+        yield from self.iterShapesList(shapes_list)
+
+    def iterStepFile(self, step_file_path: str):
+        """
+        逐个返回STEP文件中形状的解析结果，读取失败时不返回任何数据
+        """
+        shapes_list, is_split = self.loadCADShapesList(step_file_path)
+        if shapes_list is None:
+            return
 
-        return shape_data_list
+        yield from self.iterShapesList(shapes_list, is_split)
+
+    def loadStepFile(self, step_file_path: str) -> Union[list, None]:
+        shapes_list, is_split = self.loadCADShapesList(step_file_path)
+        if shapes_list is None:
+            print('[ERROR][StepLoader::loadStepFile]')
+            print('\t loadCADShapesList failed!')
+            return None
+
+        return list(self.iterShapesList(shapes_list, is_split))
 
     def renderCADData(self, shape_data: dict) -> bool:
         """
@@ -39,13 +380,18 @@ class StepLoader(object):
                        data中包含 'face_pnts' (N,32,32,4或3)
                                 'edge_pnts' (M,32,3)
                                 'edge_corner_pnts' (M,2,3)
+                       也可以是紧凑格式，渲染前自动还原
 
         Returns:
             bool: 是否成功可视化
         """
-        face_pts = shape_data['data']['face_pnts']
-        edge_pts = shape_data['data']['edge_pnts']
-        edge_corner_pts = shape_data['data']['edge_corner_pnts']
+        # open3d仅在渲染时导入，批量转换不需要加载
+        from muv_convert.Method.render import vis_faces_edges
+
+        data = expand_shape_data(shape_data['data'])
+        face_pts = data['face_pnts']
+        edge_pts = data['edge_pnts']
+        edge_corner_pts = data['edge_corner_pnts']
 
         vis_faces_edges(
             face_pts,
@@ -69,4 +415,10 @@ class StepLoader(object):
             print('\t shape_data_list is empty!')
             return False
 
+        from muv_convert.Method.render import vis_faces_edges_list
+
+        shape_data_list = [
+            {'type': shape_data['type'], 'data': expand_shape_data(shape_data['data'])}
+            for shape_data in shape_data_list
+        ]
         return vis_faces_edges_list(shape_data_list)
@@ -0,0 +1,151 @@
+import os
+from typing import Union
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+from muv_convert.Method.batch import find_files
+from muv_convert.Method.schema import expand_shape_data
+from muv_convert.Method.storage import BACKEND_EXT_DICT, load_shape_file
+from muv_convert.Method.render_utils import merge_geometry, merge_geometry_list
+from muv_convert.Method.thumbnail import render_geometry, write_png, create_contact_sheet
+
+
+def _render_file(thumbnail_renderer, file_path: str, save_png_file_path: str):
+    return thumbnail_renderer.renderFile(file_path, save_png_file_path)
+
+
+class ThumbnailRenderer(object):
+    """
+    无需显示设备，将转换结果渲染为PNG缩略图，用于批量检查转换质量
+    """
+    def __init__(
+        self,
+        image_size: int = 256,
+        azimuth: float = 45.0,
+        elevation: float = 30.0,
+    ) -> None:
+        self.image_size = image_size
+        self.azimuth = azimuth
+        self.elevation = elevation
+        return
+
+    def renderShapeDataList(self, shape_data_list: list):
+        """
+        将一个文件中的所有形状渲染到同一张图像
+
+        Returns:
+            image: (image_size, image_size, 3) uint8
+        """
+        geometry_list = []
+        for shape_data in shape_data_list:
+            data = expand_shape_data(shape_data['data'])
+            geometry_list.append(merge_geometry(data['face_pnts'], data['edge_pnts'], data['edge_corner_pnts']))
+
+        geometry = merge_geometry_list(geometry_list)
+        return render_geometry(geometry, self.image_size, self.azimuth, self.elevation)
+
+    def renderFile(self, file_path: str, save_png_file_path: Union[str, None] = None):
+        """
+        Returns:
+            image: 渲染结果，读取或渲染失败时返回None，损坏的文件不会中断批量渲染
+        """
+        try:
+            shape_data_list = load_shape_file(file_path)
+            if shape_data_list is None or len(shape_data_list) == 0:
+                print('[ERROR][ThumbnailRenderer::renderFile]')
+                print('\t load_shape_file failed or no shape!')
+                print('\t file_path:', file_path)
+                return None
+
+            image = self.renderShapeDataList(shape_data_list)
+
+            if save_png_file_path is not None:
+                save_folder_path = os.path.dirname(save_png_file_path)
+                if save_folder_path != '':
+                    os.makedirs(save_folder_path, exist_ok=True)
+                write_png(save_png_file_path, image)
+        except Exception as e:
+            print('[ERROR][ThumbnailRenderer::renderFile]')
+            print('\t render file failed:', repr(e))
+            print('\t file_path:', file_path)
+            return None
+
+        return image
+
+    def saveContactSheet(
+        self,
+        image_list: list,
+        save_png_root_folder_path: str,
+        sheet_idx: int,
+        sheet_col_num: int,
+    ) -> bool:
+        os.makedirs(save_png_root_folder_path, exist_ok=True)
+        sheet = create_contact_sheet(image_list, sheet_col_num)
+        return write_png(os.path.join(save_png_root_folder_path, 'sheet_%05d.png' % sheet_idx), sheet)
+
+    def renderFolder(
+        self,
+        data_root_folder_path: str,
+        save_png_root_folder_path: str,
+        workers: int = 1,
+        sheet_col_num: int = 8,
+        sheet_image_num: int = 64,
+    ) -> bool:
+        """
+        并行渲染文件夹下所有转换结果，保持相对路径保存缩略图，并按sheet_image_num张拼接为总览图
+
+        Args:
+            sheet_image_num: 每张总览图包含的缩略图数，0表示不生成总览图
+        """
+        if not os.path.exists(data_root_folder_path):
+            print('[ERROR][ThumbnailRenderer::renderFolder]')
+            print('\t data root folder not exist!')
+            print('\t data_root_folder_path:', data_root_folder_path)
+            return False
+
+        rel_file_path_list = find_files(data_root_folder_path, list(BACKEND_EXT_DICT.values()))
+        file_path_list = [os.path.join(data_root_folder_path, path) for path in rel_file_path_list]
+        save_png_file_path_list = [
+            os.path.join(save_png_root_folder_path, os.path.splitext(path)[0] + '.png')
+            for path in rel_file_path_list
+        ]
+
+        print('[INFO][ThumbnailRenderer::renderFolder]')
+        print('\t start render', len(file_path_list), 'files with', workers, 'workers...')
+
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            image_iter = executor.map(
+                _render_file,
+                repeat(self),
+                file_path_list,
+                save_png_file_path_list,
+                chunksize=16,
+            )
+        else:
+            executor = None
+            image_iter = map(self.renderFile, file_path_list, save_png_file_path_list)
+
+        # 逐张拼接总览图，内存中最多保留一张总览图的缩略图
+        sheet_idx = 0
+        sheet_image_list = []
+        try:
+            for image in image_iter:
+                if sheet_image_num <= 0 or image is None:
+                    continue
+
+                sheet_image_list.append(image)
+                if len(sheet_image_list) < sheet_image_num:
+                    continue
+
+                self.saveContactSheet(sheet_image_list, save_png_root_folder_path, sheet_idx, sheet_col_num)
+                sheet_idx += 1
+                sheet_image_list = []
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if len(sheet_image_list) > 0:
+            self.saveContactSheet(sheet_image_list, save_png_root_folder_path, sheet_idx, sheet_col_num)
+
+        return True
@@ -0,0 +1,38 @@
+import os
+import argparse
+
+from muv_convert.Method.batch import find_files
+from muv_convert.Module.shard_writer import ShardWriter
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='pack converted pkl files into memory-mapped shards')
+    parser.add_argument('pkl_root_folder_path', type=str)
+    parser.add_argument('save_shard_root_folder_path', type=str)
+    parser.add_argument('--shape_num_per_shard', type=int, default=100000)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+
+    rel_pkl_file_path_list = find_files(args.pkl_root_folder_path, ['.pkl'])
+
+    shard_idx = 0
+    shard_writer = None
+    failed_file_num = 0
+    for rel_pkl_file_path in rel_pkl_file_path_list:
+        if shard_writer is None:
+            shard_folder_path = os.path.join(args.save_shard_root_folder_path, 'shard_%05d' % shard_idx)
+            shard_writer = ShardWriter(shard_folder_path, args.overwrite)
+
+        if not shard_writer.addPklFile(os.path.join(args.pkl_root_folder_path, rel_pkl_file_path)):
+            failed_file_num += 1
+
+        if len(shard_writer) >= args.shape_num_per_shard:
+            shard_writer.close()
+            shard_writer = None
+            shard_idx += 1
+
+    if shard_writer is not None:
+        shard_writer.close()
+
+    if failed_file_num > 0:
+        print('[WARN][pack_dataset]')
+        print('\t', failed_file_num, '/', len(rel_pkl_file_path_list), 'pkl files not fully packed!')
@@ -0,0 +1,22 @@
+import argparse
+
+from muv_convert.Module.thumbnail_renderer import ThumbnailRenderer
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='render png thumbnails of all converted files in a folder')
+    parser.add_argument('data_root_folder_path', type=str)
+    parser.add_argument('save_png_root_folder_path', type=str)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--image_size', type=int, default=256)
+    parser.add_argument('--sheet_col_num', type=int, default=8)
+    parser.add_argument('--sheet_image_num', type=int, default=64, help='thumbnails per contact sheet, 0 to disable')
+    args = parser.parse_args()
+
+    thumbnail_renderer = ThumbnailRenderer(args.image_size)
+    thumbnail_renderer.renderFolder(
+        args.data_root_folder_path,
+        args.save_png_root_folder_path,
+        args.workers,
+        args.sheet_col_num,
+        args.sheet_image_num,
+    )